@@ -4,14 +4,17 @@ IPA分析工具 - 快速启动脚本
 提供简单易用的命令行界面
 """
 
+import argparse
+import os
 import sys
 import subprocess
 from pathlib import Path
 
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-def show_usage():
-    """显示使用说明"""
-    print("""
+
+USAGE_TEXT = """
 🔍 IPA分析工具 - 快速启动
 
 基本用法:
@@ -27,140 +30,187 @@ def show_usage():
   --verbose                      显示详细输出
   --csv                          生成CSV报告
   --similarity                   同时执行相似性分析
+  --subprocess                   在独立进程中运行分析
+  --pretty                       以缩进格式输出JSON报告
+  --fast-dup                     仅按文件大小判断重复资源
+  --streaming                    分段写入JSON报告，降低内存峰值
 
 示例:
   python analyze.py single app.ipa
   python analyze.py batch ipas/ --similarity
   python analyze.py multi app1.ipa app2.ipa --verbose
   python analyze.py similarity
-    """)
+    """
+
+
+def show_usage():
+    """显示使用说明"""
+    print(USAGE_TEXT)
 
 
 def run_enhanced_main(args):
-    """运行增强版主程序"""
-    cmd = [sys.executable, "main_enhanced.py"] + args
-    return subprocess.run(cmd)
+    """运行增强版主程序
 
+    默认在当前进程内调用，传入 --subprocess 时在独立进程中运行
+    """
+    if "--subprocess" in args:
+        args = [arg for arg in args if arg != "--subprocess"]
+        cmd = [sys.executable, "main_enhanced.py"] + args
+        return subprocess.run(cmd).returncode
 
-def main():
-    if len(sys.argv) < 2:
-        show_usage()
+    from main_enhanced import run
+    return run(args)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """构建命令行解析器"""
+    # 传递给增强版主程序的公共选项
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('-v', '--verbose', action='store_true', help='显示详细输出')
+    common.add_argument('--csv', action='store_true', help='生成CSV报告')
+    common.add_argument('--similarity', action='store_true', help='同时执行相似性分析')
+    common.add_argument('--subprocess', action='store_true', help='在独立进程中运行分析')
+    common.add_argument('--pretty', action='store_true', help='以缩进格式输出JSON报告')
+    common.add_argument('--fast-dup', action='store_true', help='仅按文件大小判断重复资源，跳过内容哈希校验')
+    common.add_argument('--streaming', action='store_true', help='分段编码写入JSON报告，降低大型IPA的内存峰值')
+    common.add_argument('-o', '--output', help='输出目录')
+    common.add_argument('--min-string-length', type=int, help='最小字符串长度')
+    common.add_argument('--max-workers', type=int, help='并行处理的最大工作进程数')
+    
+    parser = argparse.ArgumentParser(prog='analyze.py', add_help=False)
+    subparsers = parser.add_subparsers(dest='command')
+    
+    single_parser = subparsers.add_parser('single', parents=[common], help='分析单个IPA文件')
+    single_parser.add_argument('ipa_file', help='IPA文件路径')
+    
+    batch_parser = subparsers.add_parser('batch', parents=[common], help='批量分析目录中的所有IPA文件')
+    batch_parser.add_argument('directory', help='包含IPA文件的目录')
+    
+    multi_parser = subparsers.add_parser('multi', parents=[common], help='分析多个指定的IPA文件')
+    multi_parser.add_argument('ipa_files', nargs='+', help='IPA文件路径')
+    
+    similarity_parser = subparsers.add_parser('similarity', help='对已分析的文件进行相似性分析')
+    similarity_parser.add_argument('-v', '--verbose', action='store_true', help='显示详细输出')
+    
+    subparsers.add_parser('help', help='显示使用说明')
+    
+    return parser
+
+
+def _forward_args(args) -> list:
+    """将公共选项转换为增强版主程序的参数"""
+    forwarded = []
+    for flag in ('verbose', 'csv', 'similarity', 'subprocess', 'pretty', 'fast_dup', 'streaming'):
+        if getattr(args, flag):
+            forwarded.append(f"--{flag.replace('_', '-')}")
+    for option in ('output', 'min_string_length', 'max_workers'):
+        value = getattr(args, option)
+        if value is not None:
+            forwarded.extend([f"--{option.replace('_', '-')}", str(value)])
+    return forwarded
+
+
+def _do_single(args):
+    """分析单个IPA文件"""
+    print(f"📱 分析单个IPA文件: {args.ipa_file}")
+    run_enhanced_main([args.ipa_file] + _forward_args(args))
+
+
+def _do_batch(args):
+    """批量分析目录"""
+    print(f"📁 批量分析目录: {args.directory}")
+    run_enhanced_main(["--directory", args.directory] + _forward_args(args))
+
+
+def _do_multi(args):
+    """分析多个IPA文件"""
+    print(f"📱 分析多个IPA文件: {', '.join(args.ipa_files)}")
+    run_enhanced_main(args.ipa_files + _forward_args(args))
+
+
+def _do_similarity(args):
+    """对已分析的文件进行相似性分析"""
+    print("🔍 执行相似性分析...")
+    
+    # 检查是否有已分析的文件
+    analysis_dir = Path("data/analysis_reports")
+    if not analysis_dir.exists():
+        print("❌ 错误: 未找到分析报告目录")
+        print("请先分析一些IPA文件")
         sys.exit(1)
     
-    command = sys.argv[1]
+    json_files = [
+        file_path for file_path in analysis_dir.glob("*_analysis.json")
+        if not file_path.name.endswith("similarity_analysis.json")
+    ]
+    if not json_files:
+        print("❌ 错误: 未找到分析文件")
+        print("请先使用 single、batch 或 multi 命令分析IPA文件")
+        sys.exit(1)
     
-    if command == "single":
-        if len(sys.argv) < 3:
-            print("❌ 错误: 请指定IPA文件路径")
-            print("用法: python analyze.py single <ipa_file>")
-            sys.exit(1)
-        
-        ipa_file = sys.argv[2]
-        extra_args = sys.argv[3:]
-        
-        args = [ipa_file] + extra_args
-        print(f"📱 分析单个IPA文件: {ipa_file}")
-        run_enhanced_main(args)
+    print(f"找到 {len(json_files)} 个分析文件")
     
-    elif command == "batch":
-        if len(sys.argv) < 3:
-            print("❌ 错误: 请指定包含IPA文件的目录")
-            print("用法: python analyze.py batch <directory>")
-            sys.exit(1)
+    # 使用新版相似性分析器（仅在该命令下导入）
+    try:
+        from similarity_analyzer import SimilarityAnalyzer
         
-        directory = sys.argv[2]
-        extra_args = sys.argv[3:]
+        # 默认启用智能过滤，数据在生成报告前才加载
+        analyzer = SimilarityAnalyzer(filter_common_words=True, lazy=True, paths=json_files)
         
-        args = ["--directory", directory] + extra_args
-        print(f"📁 批量分析目录: {directory}")
-        run_enhanced_main(args)
-    
-    elif command == "multi":
-        if len(sys.argv) < 3:
-            print("❌ 错误: 请指定至少一个IPA文件")
-            print("用法: python analyze.py multi <file1> [file2] ...")
+        if len(json_files) < 2 or len(analyzer.apps_data) < 2:
+            print("❌ 错误: 需要至少2个已分析的应用才能进行相似性分析")
+            print("请先分析更多IPA文件")
             sys.exit(1)
         
-        ipa_files = []
-        extra_args = []
+        report = analyzer.generate_comprehensive_report()
+        analyzer.print_similarity_summary(report)
         
-        # 分离IPA文件和额外参数
-        for arg in sys.argv[2:]:
-            if arg.startswith("--"):
-                extra_args.append(arg)
-            elif arg.endswith(".ipa"):
-                ipa_files.append(arg)
-            else:
-                extra_args.append(arg)
+        # 保存报告
+        report_file = analysis_dir / "comprehensive_similarity_analysis.json"
+        analyzer.save_report(report, report_file)
         
-        if not ipa_files:
-            print("❌ 错误: 未找到IPA文件")
-            sys.exit(1)
+        print(f"\n📊 详细报告已保存到: {report_file}")
         
-        args = ipa_files + extra_args
-        print(f"📱 分析多个IPA文件: {', '.join(ipa_files)}")
-        run_enhanced_main(args)
+    except Exception as e:
+        print(f"❌ 相似性分析失败: {e}")
+        if args.verbose:
+            import traceback
+            traceback.print_exc()
+        sys.exit(1)
+
+
+def _do_help(args):
+    """显示使用说明"""
+    show_usage()
+
+
+COMMANDS = {
+    'single': _do_single,
+    'batch': _do_batch,
+    'multi': _do_multi,
+    'similarity': _do_similarity,
+    'help': _do_help,
+}
+
+
+def main():
+    if len(sys.argv) < 2:
+        show_usage()
+        sys.exit(1)
     
-    elif command == "similarity":
-        print("🔍 执行相似性分析...")
-        # 直接调用相似性分析
-        args = ["--similarity"]
-        
-        # 检查是否有已分析的文件
-        analysis_dir = Path("data/analysis_reports")
-        if not analysis_dir.exists():
-            print("❌ 错误: 未找到分析报告目录")
-            print("请先分析一些IPA文件")
-            sys.exit(1)
-        
-        json_files = list(analysis_dir.glob("*_analysis.json"))
-        if not json_files:
-            print("❌ 错误: 未找到分析文件")
-            print("请先使用 single、batch 或 multi 命令分析IPA文件")
-            sys.exit(1)
-        
-        print(f"找到 {len(json_files)} 个分析文件")
-        
-        # 使用新版相似性分析器
-        try:
-            import os
-            sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
-            
-            from similarity_analyzer import SimilarityAnalyzer
-            import json
-            
-            # 默认启用智能过滤
-            analyzer = SimilarityAnalyzer(filter_common_words=True)
-            
-            if len(analyzer.apps_data) < 2:
-                print("❌ 错误: 需要至少2个已分析的应用才能进行相似性分析")
-                print("请先分析更多IPA文件")
-                sys.exit(1)
-            
-            report = analyzer.generate_comprehensive_report()
-            analyzer.print_similarity_summary(report)
-            
-            # 保存报告
-            report_file = analysis_dir / "comprehensive_similarity_analysis.json"
-            with open(report_file, 'w', encoding='utf-8') as f:
-                json.dump(report, f, ensure_ascii=False, indent=2)
-            
-            print(f"\n📊 详细报告已保存到: {report_file}")
-            
-        except Exception as e:
-            print(f"❌ 相似性分析失败: {e}")
-            if "--verbose" in sys.argv:
-                import traceback
-                traceback.print_exc()
-            sys.exit(1)
+    command = sys.argv[1]
     
-    elif command in ["help", "-h", "--help"]:
+    if command in ["-h", "--help"]:
         show_usage()
+        return
     
-    else:
+    if command not in COMMANDS:
         print(f"❌ 错误: 未知命令 '{command}'")
         show_usage()
         sys.exit(1)
+    
+    args = build_parser().parse_args()
+    COMMANDS[args.command](args)
 
 
 if __name__ == "__main__":
@@ -4,61 +4,71 @@
 深入分析字符串重复情况
 """
 
-import json
 import sys
 import os
+import heapq
 from pathlib import Path
-from collections import Counter, defaultdict
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 
 # 添加src目录到Python路径
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from similarity_analyzer import SimilarityAnalyzer
+from utils import load_json, load_json_cached
 
 
 def load_app_data(file_path):
-    """加载应用分析数据"""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    """加载应用分析数据
+    
+    只有应用分析文件（*_analysis.json，且不是相似性报告）才在旁边维护pickle缓存，
+    其他JSON直接解析，不在任意目录留下缓存文件
+    """
+    name = os.path.basename(file_path)
+    if name.endswith('_analysis.json') and name not in SimilarityAnalyzer.REPORT_FILES:
+        return load_json_cached(file_path)
+    return load_json(file_path)
 
 
 def extract_all_strings_detailed(data):
-    """详细提取所有字符串，包含来源信息"""
-    strings_with_source = []
+    """详细提取所有字符串，包含来源信息
     
-    strings_data = data.get('strings', {})
-    categories = strings_data.get('categories', {})
+    Yields:
+        (字符串, 类别) 元组，相同内容在多个应用间共享同一个字符串对象
+    """
+    categories = data.get('strings', {}).get('categories', {})
     
     for category, string_list in categories.items():
-        if isinstance(string_list, list):
-            for item in string_list:
-                if isinstance(item, str):
-                    strings_with_source.append({
-                        'content': item,
-                        'category': category,
-                        'type': 'string'
-                    })
-                elif isinstance(item, dict) and 'content' in item:
-                    strings_with_source.append({
-                        'content': item['content'],
-                        'category': category,
-                        'type': 'dict'
-                    })
-    
-    return strings_with_source
+        if not isinstance(string_list, list):
+            continue
+        category = sys.intern(category)
+        for item in string_list:
+            if type(item) is str:
+                yield sys.intern(item), category
+            elif type(item) is dict:
+                content = item.get('content')
+                if content is not None:
+                    yield sys.intern(content), category
 
 
 def analyze_specific_apps(app_files):
     """分析指定的应用文件"""
     apps_data = {}
     
-    # 加载应用数据
+    existing_files = []
     for app_file in app_files:
         if not os.path.exists(app_file):
             print(f"❌ 文件不存在: {app_file}")
             continue
-        
-        data = load_app_data(app_file)
+        existing_files.append(app_file)
+    
+    # 并行加载应用数据，结果保持输入顺序
+    loaded_data = []
+    if existing_files:
+        with ThreadPoolExecutor(max_workers=min(8, len(existing_files))) as executor:
+            loaded_data = list(executor.map(load_app_data, existing_files))
+    
+    for app_file, data in zip(existing_files, loaded_data):
         app_name = data.get('app_info', {}).get('name', os.path.basename(app_file).replace('_analysis.json', ''))
         apps_data[app_name] = data
         print(f"✅ 加载应用: {app_name}")
@@ -72,77 +82,64 @@ def analyze_specific_apps(app_files):
     # 详细提取字符串
     apps_strings_detailed = {}
     for app_name, data in apps_data.items():
-        strings_detailed = extract_all_strings_detailed(data)
+        strings_detailed = list(extract_all_strings_detailed(data))
         apps_strings_detailed[app_name] = strings_detailed
         print(f"   {app_name}: {len(strings_detailed)} 个字符串")
     
     # 分析重复字符串
     print(f"\n🔍 分析字符串重复情况...")
     
-    # 收集所有字符串
-    all_strings = {}
-    string_to_apps = defaultdict(list)
+    # 统计每个字符串的出现次数，以及(字符串, 类别)的出现次数
+    app_counts = Counter()
+    category_counts = Counter()
     
     for app_name, strings_list in apps_strings_detailed.items():
-        app_strings = set()
-        for string_info in strings_list:
-            content = string_info['content']
-            app_strings.add(content)
-            string_to_apps[content].append({
-                'app': app_name,
-                'category': string_info['category']
-            })
-        all_strings[app_name] = app_strings
+        app_counts.update(content for content, _ in strings_list)
+        category_counts.update(strings_list)
     
     # 找出重复字符串
-    duplicate_strings = {}
-    for string_content, apps_info in string_to_apps.items():
-        if len(apps_info) > 1:
-            duplicate_strings[string_content] = apps_info
+    duplicate_strings = {content: count for content, count in app_counts.items() if count > 1}
     
     print(f"总计重复字符串: {len(duplicate_strings)}")
     
-    # 按重复次数分组
-    duplicates_by_count = defaultdict(list)
-    for string_content, apps_info in duplicate_strings.items():
-        count = len(apps_info)
-        duplicates_by_count[count].append({
-            'content': string_content,
-            'apps': [info['app'] for info in apps_info],
-            'categories': [info['category'] for info in apps_info]
-        })
+    # 按重复次数分组计数
+    duplicates_by_count = Counter(duplicate_strings.values())
     
     # 显示统计
     print(f"\n📈 重复字符串统计:")
     for count in sorted(duplicates_by_count.keys(), reverse=True):
-        strings_list = duplicates_by_count[count]
-        print(f"   出现在 {count} 个应用中: {len(strings_list)} 个字符串")
+        print(f"   出现在 {count} 个应用中: {duplicates_by_count[count]} 个字符串")
     
     # 显示前20个最重复的字符串
     print(f"\n🔄 前20个最重复的字符串:")
-    all_duplicates = []
-    for count, strings_list in duplicates_by_count.items():
-        for string_info in strings_list:
-            all_duplicates.append((count, string_info))
     
-    # 按重复次数和字符串长度排序
-    all_duplicates.sort(key=lambda x: (x[0], len(x[1]['content'])), reverse=True)
+    # 按重复次数和字符串长度取前20个
+    top_duplicates = heapq.nlargest(20, duplicate_strings.items(), key=lambda x: (x[1], len(x[0])))
     
-    for i, (count, string_info) in enumerate(all_duplicates[:20], 1):
-        content = string_info['content']
+    # 只为展示的字符串回溯来源应用和类别
+    top_sources = {content: ([], []) for content, _ in top_duplicates}
+    for app_name, strings_list in apps_strings_detailed.items():
+        for content, category in strings_list:
+            sources = top_sources.get(content)
+            if sources is not None:
+                sources[0].append(app_name)
+                sources[1].append(category)
+    
+    for i, (content, count) in enumerate(top_duplicates, 1):
+        apps, categories = top_sources[content]
         if len(content) > 60:
             content = content[:57] + "..."
-        apps_str = ', '.join(string_info['apps'])
-        categories_str = ', '.join(set(string_info['categories']))
+        apps_str = ', '.join(apps)
+        categories_str = ', '.join(set(categories))
         print(f"   {i:2}. [{count}次] {content}")
         print(f"       应用: {apps_str}")
         print(f"       类别: {categories_str}")
         print()
     
     # 计算总体统计
-    total_strings = sum(len(strings) for strings in all_strings.values())
-    unique_strings = len(set().union(*all_strings.values()))
-    duplicate_count = sum(len(apps_info) - 1 for apps_info in duplicate_strings.values())
+    total_strings = sum(app_counts.values())
+    unique_strings = len(app_counts)
+    duplicate_count = total_strings - unique_strings
     
     print(f"📊 总体统计:")
     print(f"   总字符串数: {total_strings}")
@@ -152,12 +149,12 @@ def analyze_specific_apps(app_files):
     
     # 分析不同类别的重复情况
     print(f"\n📂 按类别分析重复情况:")
-    category_duplicates = defaultdict(int)
-    for string_content, apps_info in duplicate_strings.items():
-        for info in apps_info:
-            category_duplicates[info['category']] += 1
+    category_duplicates = Counter()
+    for (content, category), count in category_counts.items():
+        if content in duplicate_strings:
+            category_duplicates[category] += count
     
-    for category, count in sorted(category_duplicates.items(), key=lambda x: x[1], reverse=True):
+    for category, count in category_duplicates.most_common():
         print(f"   {category}: {count} 个重复字符串")
 
 
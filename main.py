@@ -38,6 +38,7 @@ def parse_arguments():
     parser.add_argument('--csv', action='store_true', help='生成CSV格式报告')
     parser.add_argument('--json', action='store_true', help='生成JSON格式报告')
     parser.add_argument('-v', '--verbose', action='store_true', help='详细输出')
+    parser.add_argument('--fast-dup', action='store_true', help='仅按文件大小判断重复资源，跳过内容哈希校验')
     parser.add_argument('--min-string-length', type=int, default=4, help='最小字符串长度 (默认: 4)')
     
     return parser.parse_args()
@@ -76,7 +77,7 @@ def main():
         # 3. 分析资源
         if args.verbose:
             print("步骤 3/4: 分析资源文件...")
-        resource_analyzer = ResourceAnalyzer()
+        resource_analyzer = ResourceAnalyzer(fast_dup=args.fast_dup)
         resources_data = resource_analyzer.analyze(parser.temp_dir)
         
         # 4. 生成报告
@@ -8,10 +8,10 @@ import argparse
 import sys
 import os
 import glob
+import functools
 from pathlib import Path
 from typing import List, Dict
-import json
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
 
 # 添加src目录到Python路径
@@ -21,18 +21,30 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'tools'))
 from ipa_parser import IPAParser
 from string_extractor import StringExtractor
 from resource_analyzer import ResourceAnalyzer
-from reporter import Reporter
-from similarity_analyzer import SimilarityAnalyzer
-from analyze_ipa_similarity import IPASimilarityAnalyzer
+from utils import dump_json, dump_json_stream
+
+
+# 文件数不超过该值时直接在当前进程中依次分析，不创建进程池
+INLINE_BATCH_SIZE = 2
+
+
+@functools.lru_cache(maxsize=None)
+def _get_resource_analyzer(fast_dup: bool = False) -> ResourceAnalyzer:
+    """获取进程内复用的资源分析器，分类表和匹配规则只构建一次"""
+    return ResourceAnalyzer(fast_dup=fast_dup)
 
 
 class BatchIPAAnalyzer:
     """批量IPA分析器"""
     
-    def __init__(self, output_dir: str = "data/analysis_reports", verbose: bool = False):
+    def __init__(self, output_dir: str = "data/analysis_reports", verbose: bool = False, pretty_json: bool = False,
+                 fast_dup: bool = False, streaming: bool = False):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.verbose = verbose
+        self.pretty_json = pretty_json
+        self.fast_dup = fast_dup
+        self.streaming = streaming
         self.results = []
         
     def analyze_single_ipa(self, ipa_path: str, min_string_length: int = 4) -> Dict:
@@ -52,7 +64,7 @@ class BatchIPAAnalyzer:
             strings_data = string_extractor.analyze(binary_path)
             
             # 3. 分析资源
-            resource_analyzer = ResourceAnalyzer()
+            resource_analyzer = _get_resource_analyzer(self.fast_dup)
             resources_data = resource_analyzer.analyze(parser.temp_dir)
             
             # 4. 合并分析结果
@@ -72,8 +84,10 @@ class BatchIPAAnalyzer:
             app_name = app_info.get('name', 'unknown_app')
             json_file = self.output_dir / f"{app_name}_analysis.json"
             
-            with open(json_file, 'w', encoding='utf-8') as f:
-                json.dump(analysis_result, f, ensure_ascii=False, indent=2)
+            if self.streaming:
+                dump_json_stream(analysis_result, json_file, pretty=self.pretty_json)
+            else:
+                dump_json(analysis_result, json_file, pretty=self.pretty_json)
             
             # 清理临时文件
             parser.cleanup()
@@ -101,17 +115,31 @@ class BatchIPAAnalyzer:
                 print(f"❌ 分析失败: {ipa_path} - {e}")
             return error_result
     
-    def analyze_multiple_ipas(self, ipa_paths: List[str], min_string_length: int = 4, max_workers: int = 3) -> List[Dict]:
-        """并行分析多个IPA文件"""
+    def analyze_multiple_ipas(self, ipa_paths: List[str], min_string_length: int = 4, max_workers: int = None) -> List[Dict]:
+        """并行分析多个IPA文件
+        
+        字符串提取和资源统计是受GIL限制的纯Python计算，因此使用进程池而非线程池
+        """
         print(f"🚀 开始批量分析 {len(ipa_paths)} 个IPA文件")
         
         results = []
         
-        # 使用线程池进行并行处理
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # 提交所有任务
+        # 文件很少或只允许一个工作进程时，进程池的启动和序列化开销得不偿失
+        if len(ipa_paths) <= INLINE_BATCH_SIZE or max_workers == 1:
+            for completed, ipa_path in enumerate(ipa_paths, 1):
+                results.append(self.analyze_single_ipa(ipa_path, min_string_length))
+                print(f"进度: {completed}/{len(ipa_paths)} - {ipa_path}")
+            self.results = results
+            return results
+        
+        with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+            # 提交所有任务，只传递可序列化的基本参数
             future_to_ipa = {
-                executor.submit(self.analyze_single_ipa, ipa_path, min_string_length): ipa_path 
+                executor.submit(
+                    _analyze_ipa_in_worker, ipa_path, min_string_length,
+                    str(self.output_dir), self.verbose, self.pretty_json, self.fast_dup,
+                    self.streaming
+                ): ipa_path
                 for ipa_path in ipa_paths
             }
             
@@ -165,6 +193,8 @@ class BatchIPAAnalyzer:
         """生成相似性分析"""
         print("\n🔍 开始相似性分析...")
         
+        from similarity_analyzer import SimilarityAnalyzer
+        
         # 使用增强的相似性分析器，默认启用智能过滤
         similarity_analyzer = SimilarityAnalyzer(
             analysis_dir=str(self.output_dir), 
@@ -178,8 +208,7 @@ class BatchIPAAnalyzer:
         
         # 保存详细报告
         report_file = self.output_dir / "comprehensive_similarity_analysis.json"
-        with open(report_file, 'w', encoding='utf-8') as f:
-            json.dump(comprehensive_report, f, ensure_ascii=False, indent=2)
+        similarity_analyzer.save_report(comprehensive_report, report_file, pretty=self.pretty_json)
         
         print(f"\n📊 详细相似性报告已保存到: {report_file}")
         
@@ -197,6 +226,7 @@ class BatchIPAAnalyzer:
                 conn.close()
                 
                 if 'apps_list' in columns:
+                    from analyze_ipa_similarity import IPASimilarityAnalyzer
                     legacy_analyzer = IPASimilarityAnalyzer()
                     legacy_analyzer.analyze_all()
                 else:
@@ -207,7 +237,15 @@ class BatchIPAAnalyzer:
             print(f"ℹ️  传统相似性分析不可用: {e}")
 
 
-def parse_arguments():
+def _analyze_ipa_in_worker(ipa_path: str, min_string_length: int, output_dir: str, verbose: bool,
+                           pretty_json: bool, fast_dup: bool, streaming: bool) -> Dict:
+    """在工作进程中分析单个IPA文件"""
+    analyzer = BatchIPAAnalyzer(output_dir=output_dir, verbose=verbose, pretty_json=pretty_json, fast_dup=fast_dup,
+                                streaming=streaming)
+    return analyzer.analyze_single_ipa(ipa_path, min_string_length)
+
+
+def parse_arguments(argv: List[str] = None):
     """解析命令行参数"""
     parser = argparse.ArgumentParser(
         description='IPA文件分析工具 - 增强版',
@@ -237,50 +275,55 @@ def parse_arguments():
     parser.add_argument('--similarity', action='store_true', help='执行相似性分析')
     parser.add_argument('--csv', action='store_true', help='生成CSV格式报告')
     parser.add_argument('-v', '--verbose', action='store_true', help='详细输出')
+    parser.add_argument('--pretty', action='store_true', help='以缩进格式输出JSON报告')
+    parser.add_argument('--streaming', action='store_true', help='分段编码写入JSON报告，降低大型IPA的内存峰值')
+    parser.add_argument('--fast-dup', action='store_true', help='仅按文件大小判断重复资源，跳过内容哈希校验')
     parser.add_argument('--min-string-length', type=int, default=4, help='最小字符串长度 (默认: 4)')
-    parser.add_argument('--max-workers', type=int, default=3, help='并行处理的最大工作线程数 (默认: 3)')
+    parser.add_argument('--max-workers', type=int, default=None, help='并行处理的最大工作进程数 (默认: CPU核心数)')
     
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
 def collect_ipa_files(args) -> List[str]:
-    """收集要分析的IPA文件"""
-    ipa_files = []
+    """收集要分析的IPA文件，返回去重并排序后的路径列表"""
+    ipa_files = set()
     
     # 从命令行参数收集文件
     if args.ipa_files:
         for pattern in args.ipa_files:
             if '*' in pattern or '?' in pattern:
-                # 通配符模式
-                matched_files = glob.glob(pattern)
-                ipa_files.extend(matched_files)
-            else:
+                # 通配符模式，匹配结果本身就是存在的路径
+                ipa_files.update(glob.iglob(pattern))
+            elif os.path.exists(pattern):
                 # 直接文件路径
-                ipa_files.append(pattern)
+                ipa_files.add(pattern)
+            else:
+                print(f"警告: 文件不存在，跳过: {pattern}")
     
-    # 从目录收集文件
+    # 从目录收集文件，一次scandir同时完成筛选
     if args.directory:
-        directory = Path(args.directory)
-        if directory.exists() and directory.is_dir():
-            ipa_files.extend(str(f) for f in directory.glob('*.ipa'))
+        if os.path.isdir(args.directory):
+            with os.scandir(args.directory) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.ipa') and entry.is_file():
+                        ipa_files.add(entry.path)
         else:
             print(f"错误: 目录不存在: {args.directory}")
             sys.exit(1)
     
-    # 验证文件存在性
-    valid_files = []
-    for file_path in ipa_files:
-        if os.path.exists(file_path):
-            valid_files.append(file_path)
-        else:
-            print(f"警告: 文件不存在，跳过: {file_path}")
-    
-    return valid_files
+    return sorted(ipa_files)
 
 
-def main():
-    """主函数"""
-    args = parse_arguments()
+def run(argv: List[str] = None) -> int:
+    """执行分析流程
+
+    Args:
+        argv: 命令行参数列表，为None时使用sys.argv
+
+    Returns:
+        退出码
+    """
+    args = parse_arguments(argv)
     
     # 收集IPA文件
     ipa_files = collect_ipa_files(args)
@@ -290,16 +333,14 @@ def main():
         print("请指定IPA文件路径或使用 --directory 指定包含IPA文件的目录")
         sys.exit(1)
     
-    # 去重并排序
-    ipa_files = sorted(list(set(ipa_files)))
-    
     print(f"找到 {len(ipa_files)} 个IPA文件待分析")
     if args.verbose:
         for i, file_path in enumerate(ipa_files, 1):
             print(f"  {i}. {file_path}")
     
     # 创建批量分析器
-    analyzer = BatchIPAAnalyzer(output_dir=args.output, verbose=args.verbose)
+    analyzer = BatchIPAAnalyzer(output_dir=args.output, verbose=args.verbose, pretty_json=args.pretty,
+                                fast_dup=args.fast_dup, streaming=args.streaming)
     
     try:
         if len(ipa_files) == 1:
@@ -308,6 +349,7 @@ def main():
             
             if result['status'] == 'success':
                 # 打印单文件摘要
+                from reporter import Reporter
                 reporter = Reporter(result['analysis_result'])
                 reporter.print_summary()
                 
@@ -335,6 +377,7 @@ def main():
             
             # 生成CSV报告（如果需要）
             if args.csv:
+                from reporter import Reporter
                 successful_results = [r for r in results if r['status'] == 'success']
                 for result in successful_results:
                     try:
@@ -373,6 +416,12 @@ def main():
         sys.exit(1)
     
     print("\n🎉 所有分析任务完成！")
+    return 0
+
+
+def main():
+    """主函数"""
+    sys.exit(run())
 
 
 if __name__ == '__main__':
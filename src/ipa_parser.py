@@ -8,9 +8,18 @@ import tempfile
 import shutil
 import os
 import plistlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 
+# 解压后总大小超过该值时才按成员并行解压
+PARALLEL_EXTRACT_MIN_SIZE = 16 * 1024 * 1024
+
+# 并行解压的最大线程数
+MAX_EXTRACT_WORKERS = 8
+
+
 class IPAParser:
     """IPA文件解析器"""
     
@@ -37,8 +46,7 @@ class IPAParser:
             self.temp_dir = tempfile.mkdtemp(prefix='ipa_analysis_')
             
             # 解压IPA文件
-            with zipfile.ZipFile(self.ipa_path, 'r') as zip_ref:
-                zip_ref.extractall(self.temp_dir)
+            self._extract_archive()
             
             # 查找Payload目录中的.app文件
             payload_dir = Path(self.temp_dir) / 'Payload'
@@ -58,6 +66,54 @@ class IPAParser:
             self.cleanup()
             raise Exception(f"解压IPA文件失败: {e}")
     
+    def _extract_archive(self):
+        """解压IPA文件的全部成员到临时目录
+        
+        zlib解压时会释放GIL，较大的IPA按成员分发到线程池并行解压，
+        每个线程持有独立的ZipFile句柄
+        """
+        with zipfile.ZipFile(self.ipa_path, 'r') as zip_ref:
+            members = zip_ref.infolist()
+            total_size = sum(member.file_size for member in members)
+            workers = min(MAX_EXTRACT_WORKERS, os.cpu_count() or 1)
+            if total_size < PARALLEL_EXTRACT_MIN_SIZE or workers < 2:
+                zip_ref.extractall(self.temp_dir)
+                return
+            
+            # 目录成员体积为零，先顺序创建
+            file_members = []
+            for member in members:
+                if member.is_dir():
+                    zip_ref.extract(member, self.temp_dir)
+                else:
+                    file_members.append(member)
+        
+        local = threading.local()
+        handles = []
+        lock = threading.Lock()
+        
+        def extract_member(member):
+            zip_file = getattr(local, 'zip_file', None)
+            if zip_file is None:
+                zip_file = local.zip_file = zipfile.ZipFile(self.ipa_path, 'r')
+                with lock:
+                    handles.append(zip_file)
+            try:
+                zip_file.extract(member, self.temp_dir)
+            except FileExistsError:
+                # 其他线程同时创建了父目录，重试时目录已存在
+                zip_file.extract(member, self.temp_dir)
+        
+        # 大文件优先提交，避免最后剩下单个大文件串行解压
+        file_members.sort(key=lambda member: member.compress_size, reverse=True)
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for _ in executor.map(extract_member, file_members):
+                    pass
+        finally:
+            for zip_file in handles:
+                zip_file.close()
+    
     def get_app_info(self) -> dict:
         """获取应用基本信息
         
@@ -132,24 +188,35 @@ class IPAParser:
             'directories': []
         }
         
-        # 遍历应用目录
-        for root, dirs, files in os.walk(self.app_path):
-            resources_info['total_files'] += len(files)
+        # 单次遍历应用目录，顶层目录的大小在统计总量时一并得到
+        with os.scandir(self.app_path) as entries:
+            top_entries = list(entries)
+        
+        for entry in top_entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
             
-            for file in files:
-                file_path = Path(root) / file
+            if not is_dir:
+                resources_info['total_files'] += 1
                 try:
-                    resources_info['total_size'] += file_path.stat().st_size
-                except (OSError, IOError):
+                    resources_info['total_size'] += entry.stat().st_size
+                except OSError:
                     pass  # 忽略无法访问的文件
-        
-        # 记录主要目录
-        for item in self.app_path.iterdir():
-            if item.is_dir():
-                resources_info['directories'].append({
-                    'name': item.name,
-                    'size': self._calculate_directory_size(item)
-                })
+                continue
+            
+            file_count, dir_size = self._scan_tree(entry.path)
+            # 目录符号链接只记录大小，不计入总量
+            if not entry.is_symlink():
+                resources_info['total_files'] += file_count
+                resources_info['total_size'] += dir_size
+            
+            # 记录主要目录
+            resources_info['directories'].append({
+                'name': entry.name,
+                'size': dir_size
+            })
         
         return resources_info
     
@@ -162,19 +229,48 @@ class IPAParser:
         Returns:
             目录大小（字节）
         """
+        return self._scan_tree(str(directory))[1]
+    
+    @classmethod
+    def _scan_tree(cls, directory: str) -> tuple:
+        """递归统计目录下的文件数和总大小
+        
+        使用os.scandir遍历，DirEntry缓存了目录读取时获得的类型信息，
+        每个文件只需一次stat调用
+        
+        Args:
+            directory: 目录路径
+        
+        Returns:
+            (文件数, 总大小) 元组
+        """
+        file_count = 0
         total_size = 0
         try:
-            for root, dirs, files in os.walk(directory):
-                for file in files:
-                    file_path = Path(root) / file
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    
+                    if is_dir:
+                        # 与os.walk一致，不进入目录符号链接
+                        if not entry.is_symlink():
+                            sub_count, sub_size = cls._scan_tree(entry.path)
+                            file_count += sub_count
+                            total_size += sub_size
+                        continue
+                    
+                    file_count += 1
                     try:
-                        total_size += file_path.stat().st_size
-                    except (OSError, IOError):
+                        total_size += entry.stat().st_size
+                    except OSError:
                         pass  # 忽略无法访问的文件
-        except Exception:
+        except OSError:
             pass
         
-        return total_size
+        return file_count, total_size
     
     def cleanup(self):
         """清理临时文件"""
@@ -3,12 +3,41 @@
 负责生成分析报告，支持JSON和CSV格式输出
 """
 
-import json
 import csv
+import functools
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List
 
+from utils import dump_json
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_size(size_bytes: int) -> str:
+    """格式化文件大小，报告中大量重复的字节数直接命中缓存
+    
+    Args:
+        size_bytes: 字节数
+    
+    Returns:
+        格式化的大小字符串
+    """
+    if size_bytes == 0:
+        return "0 B"
+    
+    units = ['B', 'KB', 'MB', 'GB', 'TB']
+    unit_index = 0
+    size = float(size_bytes)
+    
+    while size >= 1024 and unit_index < len(units) - 1:
+        size /= 1024
+        unit_index += 1
+    
+    if unit_index == 0:
+        return f"{int(size)} {units[unit_index]}"
+    else:
+        return f"{size:.1f} {units[unit_index]}"
+
 
 class Reporter:
     """报告生成器"""
@@ -113,8 +142,7 @@ class Reporter:
         report_data = self._prepare_report_data()
         
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(report_data, f, ensure_ascii=False, indent=2)
+            dump_json(report_data, output_path)
         except Exception as e:
             raise Exception(f"生成JSON报告失败: {e}")
     
@@ -211,13 +239,11 @@ class Reporter:
             writer.writerow(['类别', '数量', '示例字符串'])
             
             categories = strings_data.get('categories', {})
-            for category, strings_list in categories.items():
-                if strings_list:
-                    # 取前3个作为示例
-                    examples = ', '.join(strings_list[:3])
-                    if len(strings_list) > 3:
-                        examples += f' ... (共{len(strings_list)}个)'
-                    writer.writerow([category, len(strings_list), examples])
+            writer.writerows(
+                (category, len(strings_list), self._format_examples(strings_list))
+                for category, strings_list in categories.items()
+                if strings_list
+            )
     
     def _generate_resources_csv(self, output_path: Path):
         """生成资源统计CSV"""
@@ -228,15 +254,17 @@ class Reporter:
             writer.writerow(['文件名', '路径', '大小', '类型', '扩展名'])
             
             categories = resources_data.get('categories', {})
-            for category, file_list in categories.items():
-                for file_info in file_list:
-                    writer.writerow([
-                        file_info.get('name', ''),
-                        file_info.get('path', ''),
-                        self._format_size(file_info.get('size', 0)),
-                        category,
-                        file_info.get('extension', '')
-                    ])
+            writer.writerows(
+                (
+                    file_info.get('name', ''),
+                    file_info.get('path', ''),
+                    _format_size(file_info.get('size', 0)),
+                    category,
+                    file_info.get('extension', '')
+                )
+                for category, file_list in categories.items()
+                for file_info in file_list
+            )
     
     def _generate_duplicates_csv(self, output_path: Path):
         """生成重复文件CSV"""
@@ -250,15 +278,33 @@ class Reporter:
             # 重复字符串
             duplicates = strings_data.get('duplicates', {})
             duplicate_strings = duplicates.get('strings', {})
-            for string, count in duplicate_strings.items():
-                writer.writerow(['字符串', string, count, '重复字符串'])
+            writer.writerows(
+                ('字符串', string, count, '重复字符串')
+                for string, count in duplicate_strings.items()
+            )
             
             # 重复文件（按名称）
             resource_duplicates = resources_data.get('duplicates', {})
             name_duplicates = resource_duplicates.get('by_name', {})
-            for name, file_list in name_duplicates.items():
-                paths = [f['path'] for f in file_list]
-                writer.writerow(['文件名', name, len(file_list), f"路径: {'; '.join(paths)}"])
+            writer.writerows(
+                ('文件名', name, len(file_list), f"路径: {'; '.join(f['path'] for f in file_list)}")
+                for name, file_list in name_duplicates.items()
+            )
+    
+    @staticmethod
+    def _format_examples(strings_list: List) -> str:
+        """取前3个字符串作为示例
+        
+        Args:
+            strings_list: 字符串列表
+        
+        Returns:
+            示例文本
+        """
+        examples = ', '.join(strings_list[:3])
+        if len(strings_list) > 3:
+            examples += f' ... (共{len(strings_list)}个)'
+        return examples
     
     def _format_size(self, size_bytes: int) -> str:
         """格式化文件大小
@@ -269,18 +315,4 @@ class Reporter:
         Returns:
             格式化的大小字符串
         """
-        if size_bytes == 0:
-            return "0 B"
-        
-        units = ['B', 'KB', 'MB', 'GB', 'TB']
-        unit_index = 0
-        size = float(size_bytes)
-        
-        while size >= 1024 and unit_index < len(units) - 1:
-            size /= 1024
-            unit_index += 1
-        
-        if unit_index == 0:
-            return f"{int(size)} {units[unit_index]}"
-        else:
-            return f"{size:.1f} {units[unit_index]}" 
\ No newline at end of file
+        return _format_size(size_bytes)
@@ -4,17 +4,76 @@
 """
 
 import os
+import re
+import sys
+from operator import itemgetter
 from pathlib import Path
 from collections import defaultdict
 from typing import Dict, List
+
+from utils import compile_regex
 import hashlib
+import heapq
+import mmap
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+
+# 超过该大小的文件通过mmap计算哈希，更小的文件直接读取比建立映射更快
+MMAP_HASH_THRESHOLD = 64 * 1024
+
+# 大文件先比较开头这部分内容，不同的无需读取全部内容
+HASH_PREFIX_SIZE = 4096
+
+# 大文件阈值及报告中保留的大文件数量
+LARGE_FILE_THRESHOLD = 1024 * 1024
+LARGE_FILE_LIMIT = 20
+
+
+def _content_digest(data) -> bytes:
+    """计算文件内容的哈希值，优先使用xxhash"""
+    if xxhash is not None:
+        return xxhash.xxh3_128_digest(data)
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+class _ResourceScan:
+    """单次遍历过程中累积的资源数据"""
+    
+    __slots__ = ('root', 'files', 'sizes', 'categories', 'uncategorized', 'special', 'size_groups', 'name_groups',
+                 'category_sizes', 'extension_counts', 'extension_sizes', 'large_heap', 'top_sizes', 'top_counts')
+    
+    def __init__(self, root: str, categories: List[str]):
+        self.root = root
+        self.files = []
+        self.sizes = []
+        self.categories = {category: [] for category in categories}
+        self.uncategorized = []
+        self.special = defaultdict(list)
+        self.size_groups = defaultdict(list)
+        self.name_groups = defaultdict(list)
+        self.category_sizes = defaultdict(int)
+        self.extension_counts = defaultdict(int)
+        self.extension_sizes = defaultdict(int)
+        self.large_heap = []  # (大小, -序号, 文件信息) 的小顶堆
+        self.top_sizes = defaultdict(int)
+        self.top_counts = defaultdict(int)
 
 
 class ResourceAnalyzer:
     """资源文件分析器"""
     
-    def __init__(self):
-        """初始化资源分析器"""
+    def __init__(self, fast_dup: bool = False):
+        """初始化资源分析器
+        
+        Args:
+            fast_dup: 为True时只按文件大小判断重复文件，不校验内容
+        """
+        self.fast_dup = fast_dup
+        
         self.resource_categories = {
             'images': ['.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff', '.svg', '.webp', '.ico'],
             'audio': ['.mp3', '.wav', '.m4a', '.aac', '.ogg', '.wma', '.flac'],
@@ -36,6 +95,33 @@ class ResourceAnalyzer:
             'storyboards': ['.storyboard', '.nib', '.xib'],
             'assets': ['Assets.car', '.car']
         }
+        
+        # 扩展名到类别的映射，分类时只需一次查表
+        self._ext_to_category = {}
+        for category, extensions in self.resource_categories.items():
+            for extension in extensions:
+                self._ext_to_category.setdefault(extension, category)
+        
+        # 应用图标和启动图像按文件名子串匹配，按优先级排列
+        self._special_name_matchers = [
+            (category, self._compile_literals(self.special_files[category]))
+            for category in ('app_icons', 'launch_images')
+        ]
+        
+        # 本地化文件按路径匹配，目录部分每个目录只判断一次
+        self._localization_pattern = self._compile_literals(self.special_files['localization'])
+        
+        # 故事板和资源包按扩展名查表
+        self._special_by_ext = {}
+        for category in ('storyboards', 'assets'):
+            for pattern in self.special_files[category]:
+                extension = pattern if pattern.startswith('.') else self._get_extension(pattern)
+                self._special_by_ext.setdefault(extension.lower(), category)
+    
+    @staticmethod
+    def _compile_literals(patterns: List[str]):
+        """将一组字面子串编译为单个正则"""
+        return compile_regex('|'.join(re.escape(pattern) for pattern in patterns))
     
     def analyze(self, app_directory: str) -> Dict:
         """分析应用目录中的资源文件
@@ -53,265 +139,348 @@ class ResourceAnalyzer:
         if app_dirs:
             app_path = app_dirs[0]
         
-        # 收集所有文件信息
-        all_files = self._collect_files(app_path)
+        # 一次遍历收集文件并累积分类、分组和统计数据
+        scan = self._single_pass(app_path)
         
         # 按类型分类
-        categorized_files = self._categorize_files(all_files)
-        
-        # 分析特殊文件
-        special_files = self._analyze_special_files(all_files)
-        
-        # 计算统计信息
-        statistics = self._calculate_statistics(all_files, categorized_files)
-        
-        # 查找重复文件
-        duplicates = self._find_duplicate_files(all_files)
+        categorized_files = self._categorize_files(scan)
         
         return {
-            'total_files': len(all_files),
-            'total_size': sum(file_info['size'] for file_info in all_files),
+            'total_files': len(scan.files),
+            'total_size': sum(scan.sizes),
             'categories': categorized_files,
-            'special_files': special_files,
-            'statistics': statistics,
-            'duplicates': duplicates,
-            'large_files': self._get_large_files(all_files, 1024*1024),  # >1MB
-            'directory_structure': self._analyze_directory_structure(app_path)
+            'special_files': dict(scan.special),
+            'statistics': self._calculate_statistics(scan, categorized_files),
+            'duplicates': self._find_duplicate_files(scan),
+            'large_files': self._get_large_files(scan),  # >1MB
+            'directory_structure': self._analyze_directory_structure(app_path, scan)
         }
     
-    def _collect_files(self, app_path: Path) -> List[Dict]:
-        """收集应用目录中的所有文件信息"""
-        files = []
+    def _single_pass(self, app_path: Path) -> _ResourceScan:
+        """遍历应用目录，在同一次遍历中完成分类、分组和统计的累积"""
+        scan = _ResourceScan(str(app_path), self.resource_categories)
         
         try:
-            for root, dirs, file_names in os.walk(app_path):
-                root_path = Path(root)
-                
-                for file_name in file_names:
-                    file_path = root_path / file_name
-                    
-                    try:
-                        file_stat = file_path.stat()
-                        relative_path = file_path.relative_to(app_path)
-                        
-                        file_info = {
-                            'name': file_name,
-                            'path': str(relative_path),
-                            'full_path': str(file_path),
-                            'size': file_stat.st_size,
-                            'extension': file_path.suffix.lower(),
-                            'directory': str(relative_path.parent),
-                            'modified_time': file_stat.st_mtime
-                        }
-                        
-                        files.append(file_info)
-                        
-                    except (OSError, IOError) as e:
-                        print(f"警告: 无法访问文件 {file_path}: {e}")
-                        continue
-                        
+            self._scan_directory(scan.root, '', '', scan)
         except Exception as e:
             print(f"警告: 遍历目录时出错: {e}")
         
-        return files
+        return scan
     
-    def _categorize_files(self, files: List[Dict]) -> Dict[str, List[Dict]]:
-        """按类型分类文件"""
-        categories = defaultdict(list)
-        uncategorized = []
-        
-        for file_info in files:
-            extension = file_info['extension']
-            categorized = False
-            
-            # 检查文件扩展名
-            for category, extensions in self.resource_categories.items():
-                if extension in extensions:
-                    categories[category].append(file_info)
-                    categorized = True
-                    break
-            
-            if not categorized:
-                uncategorized.append(file_info)
+    def _scan_directory(self, directory: str, relative_dir: str, top: str, scan: _ResourceScan):
+        """递归扫描目录，顺序与os.walk自顶向下遍历一致
+        
+        Args:
+            directory: 当前目录的完整路径
+            relative_dir: 当前目录相对于应用根目录的路径，根目录为空字符串
+            top: 当前目录所属的顶层目录名，根目录为空字符串
+            scan: 累积结果
+        """
+        subdirs = []
         
-        # 添加未分类文件
-        categories['uncategorized'] = uncategorized
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            return  # 与os.walk一致，忽略无法读取的目录
         
-        # 转换为普通字典并按大小排序
-        result = {}
-        for category, file_list in categories.items():
-            result[category] = sorted(file_list, key=lambda x: x['size'], reverse=True)
+        files = scan.files
+        categories = scan.categories
+        ext_to_category = self._ext_to_category
+        special_name_matchers = self._special_name_matchers
+        special_by_ext = self._special_by_ext
+        localization_pattern = self._localization_pattern
+        # 路径中的本地化标记不会跨越分隔符，目录部分只需判断一次
+        directory_localized = localization_pattern.search(relative_dir) is not None
+        # 同一目录下的文件共享目录名对象
+        directory_name = sys.intern(relative_dir or '.')
+        
+        with entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                
+                if is_dir:
+                    # 子目录也计入顶层目录的条目数，与rglob('*')一致
+                    if top:
+                        scan.top_counts[top] += 1
+                    # 不进入符号链接目录
+                    if not entry.is_symlink():
+                        subdirs.append(entry)
+                    continue
+                
+                file_name = entry.name
+                
+                try:
+                    file_stat = entry.stat()
+                except (OSError, IOError) as e:
+                    print(f"警告: 无法访问文件 {entry.path}: {e}")
+                    continue
+                
+                size = file_stat.st_size
+                # 扩展名种类很少，驻留后所有文件共享同一字符串对象
+                extension = sys.intern(self._get_extension(file_name))
+                file_info = {
+                    'name': file_name,
+                    'path': relative_dir + os.sep + file_name if relative_dir else file_name,
+                    'size': size,
+                    'extension': extension,
+                    'directory': directory_name,
+                    'modified_time': file_stat.st_mtime
+                }
+                
+                files.append(file_info)
+                scan.sizes.append(size)
+                
+                # 按扩展名分类
+                category = ext_to_category.get(extension)
+                if category is None:
+                    scan.uncategorized.append(file_info)
+                    scan.category_sizes['uncategorized'] += size
+                else:
+                    categories[category].append(file_info)
+                    scan.category_sizes[category] += size
+                
+                # 依次检查应用图标、启动图像、本地化文件（按路径）、故事板和资源包，归入第一个匹配的类别
+                for special_category, pattern in special_name_matchers:
+                    if pattern.search(file_name):
+                        break
+                else:
+                    if directory_localized or localization_pattern.search(file_name):
+                        special_category = 'localization'
+                    else:
+                        special_category = special_by_ext.get(extension)
+                if special_category is not None:
+                    scan.special[special_category].append(file_info)
+                
+                # 重复文件候选分组
+                scan.size_groups[size].append(file_info)
+                scan.name_groups[file_name].append(file_info)
+                
+                # 扩展名统计
+                extension_key = extension or 'no_extension'
+                scan.extension_counts[extension_key] += 1
+                scan.extension_sizes[extension_key] += size
+                
+                # 保留最大的若干个大文件，大小相同时先遍历到的优先
+                if size > LARGE_FILE_THRESHOLD:
+                    item = (size, -len(files), file_info)
+                    if len(scan.large_heap) < LARGE_FILE_LIMIT:
+                        heapq.heappush(scan.large_heap, item)
+                    else:
+                        heapq.heappushpop(scan.large_heap, item)
+                
+                # 顶层目录汇总
+                if top:
+                    scan.top_sizes[top] += size
+                    scan.top_counts[top] += 1
+        
+        for entry in subdirs:
+            sub_relative = relative_dir + os.sep + entry.name if relative_dir else entry.name
+            self._scan_directory(entry.path, sub_relative, top or entry.name, scan)
+    
+    @staticmethod
+    def _get_extension(file_name: str) -> str:
+        """获取小写扩展名，规则与Path.suffix一致"""
+        dot_index = file_name.rfind('.')
+        if 0 < dot_index < len(file_name) - 1:
+            return file_name[dot_index:].lower()
+        return ''
+    
+    def _categorize_files(self, scan: _ResourceScan) -> Dict[str, List[Dict]]:
+        """整理按类型分类的文件，输出顺序与resource_categories一致"""
+        # 去掉空类别，添加未分类文件，组内按大小降序排序
+        result = {category: file_list for category, file_list in scan.categories.items() if file_list}
+        result['uncategorized'] = scan.uncategorized
+        for file_list in result.values():
+            file_list.sort(key=itemgetter('size'), reverse=True)
         
         return result
     
-    def _analyze_special_files(self, files: List[Dict]) -> Dict[str, List[Dict]]:
-        """分析特殊文件"""
-        special = defaultdict(list)
+    def _calculate_statistics(self, scan: _ResourceScan, categorized: Dict[str, List[Dict]]) -> Dict:
+        """计算统计信息
         
-        for file_info in files:
-            file_name = file_info['name']
-            file_path = file_info['path']
-            
-            # 检查应用图标
-            if any(icon_pattern in file_name for icon_pattern in self.special_files['app_icons']):
-                special['app_icons'].append(file_info)
-            
-            # 检查启动图像
-            elif any(launch_pattern in file_name for launch_pattern in self.special_files['launch_images']):
-                special['launch_images'].append(file_info)
-            
-            # 检查本地化文件
-            elif any(loc_pattern in file_path for loc_pattern in self.special_files['localization']):
-                special['localization'].append(file_info)
-            
-            # 检查故事板文件
-            elif any(sb_pattern in file_name for sb_pattern in self.special_files['storyboards']):
-                special['storyboards'].append(file_info)
-            
-            # 检查资源包文件
-            elif any(asset_pattern in file_name for asset_pattern in self.special_files['assets']):
-                special['assets'].append(file_info)
+        Args:
+            scan: 遍历累积的结果
+            categorized: 按类别分组的文件（组内已按大小降序排列）
         
-        return dict(special)
-    
-    def _calculate_statistics(self, files: List[Dict], categorized: Dict[str, List[Dict]]) -> Dict:
-        """计算统计信息"""
-        if not files:
+        Returns:
+            统计信息
+        """
+        sizes = scan.sizes
+        if not sizes:
             return {}
         
-        sizes = [file_info['size'] for file_info in files]
+        total_size = sum(sizes)
         
-        # 按类别统计
+        # 按类别统计，总大小在遍历时已累计，组内已按大小降序排列，首个即最大文件
         category_stats = {}
         for category, file_list in categorized.items():
             if file_list:
-                category_sizes = [f['size'] for f in file_list]
+                category_total = scan.category_sizes[category]
                 category_stats[category] = {
                     'count': len(file_list),
-                    'total_size': sum(category_sizes),
-                    'avg_size': sum(category_sizes) / len(category_sizes),
-                    'largest_file': max(file_list, key=lambda x: x['size'])
+                    'total_size': category_total,
+                    'avg_size': category_total / len(file_list),
+                    'largest_file': file_list[0]
                 }
         
-        # 扩展名统计
-        extension_stats = defaultdict(lambda: {'count': 0, 'total_size': 0})
-        for file_info in files:
-            ext = file_info['extension'] or 'no_extension'
-            extension_stats[ext]['count'] += 1
-            extension_stats[ext]['total_size'] += file_info['size']
-        
-        # 转换为普通字典并排序
-        extension_stats = dict(sorted(extension_stats.items(), 
-                                    key=lambda x: x[1]['total_size'], reverse=True))
+        # 按总大小排序，取前20个扩展名
+        top_extensions = heapq.nlargest(20, scan.extension_sizes.items(), key=itemgetter(1))
+        extension_stats = {
+            ext: {'count': scan.extension_counts[ext], 'total_size': ext_size}
+            for ext, ext_size in top_extensions
+        }
         
         return {
             'size_stats': {
                 'min': min(sizes),
                 'max': max(sizes),
-                'avg': sum(sizes) / len(sizes),
-                'total': sum(sizes)
+                'avg': total_size / len(sizes),
+                'total': total_size
             },
             'category_stats': category_stats,
-            'extension_stats': dict(list(extension_stats.items())[:20])  # 前20个扩展名
+            'extension_stats': extension_stats  # 前20个扩展名
         }
     
-    def _find_duplicate_files(self, files: List[Dict]) -> Dict:
-        """查找重复文件（基于文件大小和名称）"""
-        # 按文件大小分组
-        size_groups = defaultdict(list)
-        for file_info in files:
-            size_groups[file_info['size']].append(file_info)
-        
-        # 查找可能的重复文件
-        potential_duplicates = []
-        for size, file_list in size_groups.items():
-            if len(file_list) > 1 and size > 0:  # 忽略空文件
-                potential_duplicates.extend(file_list)
-        
-        # 按文件名分组查找同名文件
-        name_groups = defaultdict(list)
-        for file_info in files:
-            name_groups[file_info['name']].append(file_info)
-        
-        same_name_files = []
-        for name, file_list in name_groups.items():
+    def _find_duplicate_files(self, scan: _ResourceScan) -> Dict:
+        """查找重复文件
+        
+        先按文件大小分组，再对同大小的候选文件计算内容哈希确认是否真正重复；
+        fast_dup模式下跳过哈希校验，只按大小判断。
+        """
+        # 同大小且内容一致的文件才视为重复，每个大小下按内容分成若干组
+        by_size = {}
+        potential_count = 0
+        for size, file_list in scan.size_groups.items():
+            if len(file_list) < 2 or size == 0:  # 忽略空文件
+                continue
+            
+            if self.fast_dup:
+                groups = [file_list]
+            else:
+                candidates = [(file_info, os.path.join(scan.root, file_info['path'])) for file_info in file_list]
+                candidate_groups = [candidates]
+                if size > MMAP_HASH_THRESHOLD:
+                    candidate_groups = self._split_by_digest(candidate_groups, self._hash_prefix)
+                candidate_groups = self._split_by_digest(candidate_groups, lambda path: self._hash_file(path, size))
+                groups = [[file_info for file_info, _ in group] for group in candidate_groups]
+            
+            if groups:
+                by_size[size] = [[self._duplicate_entry(file_info) for file_info in group] for group in groups]
+                for group in groups:
+                    potential_count += len(group)
+        
+        # 同名文件
+        by_name = {}
+        same_name_count = 0
+        for name, file_list in scan.name_groups.items():
             if len(file_list) > 1:
-                same_name_files.extend(file_list)
+                by_name[name] = [self._duplicate_entry(file_info) for file_info in file_list]
+                same_name_count += len(file_list)
         
         return {
-            'by_size': self._group_by_size(potential_duplicates),
-            'by_name': self._group_by_name(same_name_files),
-            'potential_count': len(potential_duplicates),
-            'same_name_count': len(same_name_files)
+            'by_size': by_size,
+            'by_name': by_name,
+            'potential_count': potential_count,
+            'same_name_count': same_name_count
         }
     
-    def _group_by_size(self, files: List[Dict]) -> Dict:
-        """按文件大小分组"""
-        groups = defaultdict(list)
-        for file_info in files:
-            groups[file_info['size']].append({
-                'name': file_info['name'],
-                'path': file_info['path'],
-                'size': file_info['size']
-            })
-        
-        # 只返回有多个文件的组
-        return {size: file_list for size, file_list in groups.items() if len(file_list) > 1}
+    @staticmethod
+    def _duplicate_entry(file_info: Dict) -> Dict:
+        """生成重复文件列表中的条目"""
+        return {
+            'name': file_info['name'],
+            'path': file_info['path'],
+            'size': file_info['size']
+        }
     
-    def _group_by_name(self, files: List[Dict]) -> Dict:
-        """按文件名分组"""
-        groups = defaultdict(list)
-        for file_info in files:
-            groups[file_info['name']].append({
-                'name': file_info['name'],
-                'path': file_info['path'],
-                'size': file_info['size']
-            })
-        
-        # 只返回有多个文件的组
-        return {name: file_list for name, file_list in groups.items() if len(file_list) > 1}
+    @staticmethod
+    def _split_by_digest(candidate_groups: List[List[tuple]], digest_func) -> List[List[tuple]]:
+        """将每组候选文件按摘要继续细分，只保留摘要相同的文件组成的组
+        
+        Args:
+            candidate_groups: 候选组列表，每组为 (文件信息, 完整路径) 列表
+            digest_func: 根据完整路径计算摘要的函数，失败时返回None
+        
+        Returns:
+            细分后至少包含两个文件的组
+        """
+        result = []
+        for candidates in candidate_groups:
+            groups = defaultdict(list)
+            for candidate in candidates:
+                digest = digest_func(candidate[1])
+                if digest is not None:
+                    groups[digest].append(candidate)
+            result.extend(group for group in groups.values() if len(group) > 1)
+        return result
+    
+    @staticmethod
+    def _hash_prefix(file_path: str):
+        """计算文件开头部分的哈希，读取失败时返回None"""
+        try:
+            with open(file_path, 'rb') as f:
+                return _content_digest(f.read(HASH_PREFIX_SIZE))
+        except OSError:
+            return None
     
-    def _get_large_files(self, files: List[Dict], threshold: int) -> List[Dict]:
-        """获取大文件列表"""
-        large_files = [f for f in files if f['size'] > threshold]
-        return sorted(large_files, key=lambda x: x['size'], reverse=True)[:20]  # 前20个大文件
+    @staticmethod
+    def _hash_file(file_path: str, size: int):
+        """计算文件内容哈希，大文件通过mmap读取
+        
+        Args:
+            file_path: 文件完整路径
+            size: 文件大小
+        
+        Returns:
+            内容哈希，读取失败时返回None
+        """
+        try:
+            with open(file_path, 'rb') as f:
+                if size > MMAP_HASH_THRESHOLD:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                        return _content_digest(data)
+                return _content_digest(f.read())
+        except (OSError, ValueError):
+            return None
     
-    def _analyze_directory_structure(self, app_path: Path) -> Dict:
-        """分析目录结构"""
+    def _get_large_files(self, scan: _ResourceScan) -> List[Dict]:
+        """获取大文件列表，按大小降序排列"""
+        return [file_info for _, _, file_info in sorted(scan.large_heap, reverse=True)]
+    
+    def _analyze_directory_structure(self, app_path: Path, scan: _ResourceScan) -> Dict:
+        """分析目录结构，顶层目录的大小和文件数取自遍历时的汇总
+        
+        Args:
+            app_path: 应用目录路径
+            scan: 遍历累积的结果
+        
+        Returns:
+            顶层条目的类型、大小及包含的文件数
+        """
         structure = {}
         
         try:
-            for item in app_path.iterdir():
-                if item.is_dir():
-                    dir_size = self._calculate_directory_size(item)
-                    file_count = len(list(item.rglob('*')))
-                    
-                    structure[item.name] = {
-                        'type': 'directory',
-                        'size': dir_size,
-                        'file_count': file_count
-                    }
-                else:
-                    structure[item.name] = {
-                        'type': 'file',
-                        'size': item.stat().st_size if item.exists() else 0
-                    }
+            with os.scandir(app_path) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        structure[entry.name] = {
+                            'type': 'directory',
+                            'size': scan.top_sizes[entry.name],
+                            'file_count': scan.top_counts[entry.name]
+                        }
+                    else:
+                        try:
+                            size = entry.stat().st_size
+                        except OSError:
+                            size = 0
+                        structure[entry.name] = {
+                            'type': 'file',
+                            'size': size
+                        }
         except Exception as e:
             print(f"警告: 分析目录结构时出错: {e}")
         
         return structure
-    
-    def _calculate_directory_size(self, directory: Path) -> int:
-        """计算目录大小"""
-        total_size = 0
-        try:
-            for file_path in directory.rglob('*'):
-                if file_path.is_file():
-                    try:
-                        total_size += file_path.stat().st_size
-                    except (OSError, IOError):
-                        pass
-        except Exception:
-            pass
-        
-        return total_size 
\ No newline at end of file
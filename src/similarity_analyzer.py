@@ -3,110 +3,262 @@
 用于分析多个IPA文件之间的字符串和资源相似性/重复性
 """
 
-import json
 import os
+import re
+import sys
+import types
+import heapq
+import pickle
+import hashlib
+import functools
 from collections import defaultdict, Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
 from typing import Dict, List, Set, Tuple
 from pathlib import Path
-from difflib import SequenceMatcher
-import hashlib
+
+from utils import build_membership_bitsets, dump_json_stream, dump_pickle_atomic, load_json_cached, popcount
+
+
+# 分析文件达到该数量时才使用进程池并行加载，文件少时进程启动开销大于解析耗时
+PARALLEL_LOAD_MIN_FILES = 8
+
+# 字符串过滤结果缓存的最大条目数
+FILTER_CACHE_SIZE = 200_000
+
+# 字符串提取缓存的格式版本，缓存结构变化时递增使旧缓存失效。
+# 过滤规则本身的变化由过滤配置指纹覆盖，无需手动递增
+STRINGS_CACHE_VERSION = 1
+
+# 决定字符串提取结果的过滤属性和方法，计算过滤配置指纹时使用
+_FILTER_ATTRIBUTES = (
+    'min_meaningful_length', 'common_words', 'meaningful_words', 'technical_prefixes',
+    'domain_pattern', 'format_pattern', 'error_keyword_pattern', 'system_error_pattern',
+    'ui_keyword_pattern', 'chinese_ui_pattern', 'technical_literal_pattern',
+)
+_FILTER_METHODS = ('_extract_all_strings', '_should_filter_string', '_is_technical_string', '_is_meaningful_string')
+
+# 常见开发词汇过滤器的词表和模式，在模块导入时构建一次
+# 编程通用词汇
+_PROGRAMMING_WORDS = {
+    'main', 'error', 'com', 'index', 'app', 'application', 'system', 'data', 'info',
+    'debug', 'config', 'settings', 'default', 'value', 'key', 'name', 'type', 'size',
+    'count', 'number', 'string', 'text', 'file', 'path', 'url', 'http', 'https',
+    'www', 'api', 'json', 'xml', 'html', 'css', 'js', 'javascript', 'true', 'false',
+    'null', 'undefined', 'nil', 'empty', 'new', 'old', 'tmp', 'temp', 'cache',
+    'log', 'logs', 'trace', 'warn', 'warning', 'fatal', 'exception', 'status',
+    'state', 'flag', 'option', 'param', 'parameter', 'arg', 'argument', 'var',
+    'variable', 'function', 'method', 'class', 'object', 'instance', 'property',
+    'field', 'member', 'static', 'public', 'private', 'protected', 'internal'
+}
+
+# iOS/移动开发相关词汇
+_IOS_WORDS = {
+    'ios', 'iphone', 'ipad', 'apple', 'swift', 'objective', 'objc', 'xcode',
+    'foundation', 'uikit', 'core', 'framework', 'library', 'bundle', 'plist',
+    'nib', 'xib', 'storyboard', 'segue', 'view', 'controller', 'navigation',
+    'tab', 'table', 'collection', 'scroll', 'button', 'label', 'image', 'icon',
+    'background', 'foreground', 'animation', 'transition', 'gesture', 'touch',
+    'delegate', 'datasource', 'protocol', 'notification', 'observer', 'target',
+    'action', 'outlet', 'ibaction', 'iboutlet', 'autolayout', 'constraint',
+    'margin', 'padding', 'frame', 'bounds', 'center', 'origin', 'width', 'height'
+}
+
+# 系统和框架词汇
+_SYSTEM_WORDS = {
+    'version', 'build', 'release', 'beta', 'alpha', 'production', 'development',
+    'test', 'testing', 'unit', 'integration', 'mock', 'stub', 'fake', 'sample',
+    'example', 'demo', 'tutorial', 'guide', 'help', 'support', 'documentation',
+    'readme', 'license', 'copyright', 'author', 'created', 'updated', 'modified',
+    'date', 'time', 'timestamp', 'uuid', 'identifier', 'id', 'uid', 'session',
+    'token', 'auth', 'authentication', 'authorization', 'login', 'logout',
+    'user', 'admin', 'guest', 'role', 'permission', 'access', 'security'
+}
+
+# 网络和数据相关
+_NETWORK_WORDS = {
+    'network', 'internet', 'connection', 'request', 'response', 'client', 'server',
+    'host', 'port', 'protocol', 'tcp', 'udp', 'socket', 'ssl', 'tls', 'certificate',
+    'encryption', 'hash', 'md5', 'sha', 'base64', 'encoding', 'decoding', 'utf8',
+    'ascii', 'unicode', 'locale', 'language', 'localization', 'internationalization',
+    'database', 'sql', 'sqlite', 'mysql', 'postgres', 'mongodb', 'redis', 'cache'
+}
+
+# 通用技术词汇
+_TECH_WORDS = {
+    'algorithm', 'performance', 'optimization', 'memory', 'cpu', 'gpu', 'thread',
+    'queue', 'stack', 'heap', 'garbage', 'collection', 'reference', 'pointer',
+    'allocation', 'deallocation', 'leak', 'retain', 'release', 'autorelease',
+    'weak', 'strong', 'copy', 'mutable', 'immutable', 'readonly', 'readwrite'
+}
+
+# 合并所有过滤词汇
+_COMMON_WORDS = frozenset(_PROGRAMMING_WORDS | _IOS_WORDS | _SYSTEM_WORDS | _NETWORK_WORDS | _TECH_WORDS)
+
+# 过滤用的正则表达式，所有分析器实例共享同一份编译结果
+_DOMAIN_PATTERN = re.compile(r'.*\.(com|org|net|edu|gov|mil|int|co\.|app)$')
+
+# 纯数字、版本号、十六进制、UUID、文件路径和URL合并为一个锚定模式
+_FORMAT_PATTERN = re.compile(
+    r'^(?:\d+|\d+\.\d+(?:\.\d+)?|[0-9a-fA-F]{8,}'
+    r'|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}'
+    r'|/[a-zA-Z0-9/_.-]*)$'
+    r'|^https?://'
+)
+
+# 有意义字符串的关键词，各组合并为一个正则
+_ERROR_KEYWORD_PATTERN = re.compile(
+    '|'.join(['error', 'warning', 'fail', 'exception', 'invalid', 'missing', 'not found', 'denied'])
+)
+_SYSTEM_ERROR_PATTERN = re.compile('|'.join(['NSArray', 'Swift Array', 'Down-casted', 'swift_task']))
+_UI_KEYWORD_PATTERN = re.compile(
+    '|'.join(['button', 'click', 'tap', 'swipe', 'loading', 'success', 'cancel', 'confirm', 'ok', 'yes', 'no'])
+)
+_CHINESE_UI_PATTERN = re.compile('|'.join(['请', '您', '确认', '取消', '成功', '失败', '错误', '警告']))
+_MEANINGFUL_WORDS = frozenset([
+    'get', 'set', 'create', 'delete', 'update', 'load', 'save', 'send', 'receive',
+    'connect', 'disconnect', 'start', 'stop', 'play', 'pause', 'open', 'close'
+])
+
+# 技术性字符串过滤模式
+_FRAMEWORK_PREFIXES = ('Foundation', 'CoreData', 'CoreGraphics', 'UIKit', 'AVFoundation')
+
+# 技术性字符串的固定前缀，str.startswith一次比较整个元组
+_TECHNICAL_PREFIXES = _FRAMEWORK_PREFIXES + (
+    '<!DOCTYPE', '<?xml', '<plist',  # plist文件头或XML声明
+    '@rpath/', '_swift_',  # 框架路径和Swift内部符号
+    '/usr/lib/', '/System/Library/'  # 系统库路径
+)
+
+# 技术性字符串中出现的固定子串，合并为一个正则，每个字符串只扫描一次
+_TECHNICAL_LITERALS = (
+    # Swift符号（包含"_$s"开头的符号）和Objective-C类型编码
+    ['$s', '@"', '@0:', 'v48@', 'v40@', 'v56@', '_$', '16@']
+    # 证书相关文本
+    + ['Reliance on this certificate', 'Certificate', 'Developer Relations']
+    # WebView相关的方法名（技术性API）
+    + ['webView:', 'WKWebView', 'WKNavigation', 'WKContext']
+    # 框架名前缀出现在符号中间，以及框架路径
+    + [f'.{prefix}' for prefix in _FRAMEWORK_PREFIXES] + ['.framework/']
+    # iOS系统通知和常量
+    + ['_UIApplication', '_NSNotification', 'UIApplicationMain',
+       'com.apple.developer', '#com.apple', 'NSArray element',
+       'Down-casted Array', 'Swift Array', 'failed to match']
+    # Objective-C和Swift运行时函数
+    + ['_objc_', 'swift_task_', 'swift_retain', 'swift_release',
+       'objc_msgSend', 'objc_retain', 'objc_autorelease']
+    # 系统错误消息模式
+    + ['cannot throw', 'reported an error', 'Thread Local Context', 'AutoreleasedReturnValue']
+    # UI系统常量和通知
+    + ['_UIKeyboard', '_NSForeground', '_NSBackground', 'AttributeName',
+       'LayoutDirection', 'StatusBarStyle', 'URLOptionsKey', 'ProxySettings',
+       'OrientationProvider', 'TextLayout', '_CFNetwork']
+    # Facebook SDK和第三方框架常量
+    + ['_FBSDK', 'AppEventParameterName', 'AppEventName', 'FacebookSDK']
+    # XML声明
+    + ['version="1.0"']
+    # 系统调试和错误相关
+    + ['debugDescription', 'radr://', '.cxx_destruct', 'Apple Inc.', '_SKErrorDomain', 'radar://']
+    # 系统默认管理器和中心
+    + ['standardUserDefaults', 'defaultManager', 'defaultCenter',
+       'sharedApplication', 'mainBundle', 'currentDevice']
+)
+_TECHNICAL_LITERAL_PATTERN = re.compile('|'.join(map(re.escape, _TECHNICAL_LITERALS)))
+
+
+def _stable_repr(value) -> str:
+    """生成与哈希种子无关的稳定文本表示，用于计算缓存指纹
+    
+    集合按元素排序，正则取模式和标志，代码对象取字节码、引用名和常量
+    """
+    if isinstance(value, re.Pattern):
+        return f"re({value.pattern!r}, {value.flags})"
+    if isinstance(value, (set, frozenset)):
+        return '{' + ', '.join(sorted(map(_stable_repr, value))) + '}'
+    if isinstance(value, (tuple, list)):
+        return '(' + ', '.join(map(_stable_repr, value)) + ')'
+    if isinstance(value, types.CodeType):
+        return f"code({value.co_code!r}, {value.co_names!r}, {_stable_repr(value.co_consts)})"
+    return repr(value)
 
 
 class SimilarityAnalyzer:
     """相似性分析器"""
     
-    def __init__(self, analysis_dir: str = "data/analysis_reports", filter_common_words: bool = True, target_apps: List[str] = None):
+    # 分析目录中由相似性分析生成、不属于单个应用的报告文件
+    REPORT_FILES = ("similarity_analysis.json", "comprehensive_similarity_analysis.json")
+    
+    # 不参与字符串相似性比较的字符串类别
+    SKIPPED_STRING_CATEGORIES = frozenset(('uncategorized', 'domains', 'class_methods'))
+    
+    def __init__(self, analysis_dir: str = "data/analysis_reports", filter_common_words: bool = True, target_apps: List[str] = None,
+                 lazy: bool = False, paths: List[Path] = None):
         """初始化相似性分析器
         
         Args:
             analysis_dir: 分析报告目录
             filter_common_words: 是否过滤常见开发词汇
             target_apps: 指定要分析的应用列表，如果为None则分析所有应用
+            lazy: 为True时推迟到首次访问apps_data时才加载分析数据
+            paths: 已知的分析文件列表，提供时不再扫描analysis_dir
         """
         self.analysis_dir = Path(analysis_dir)
         self.filter_common_words = filter_common_words
         self.target_apps = target_apps
-        self.apps_data = {}
+        self._apps_data = None
+        self._app_sources = {}
+        self._analysis_files = None
+        self._filter_fingerprint = None
+        if paths is not None:
+            self._analysis_files = [Path(p) for p in paths if Path(p).name not in self.REPORT_FILES]
         self._init_common_words_filter()
-        self.load_analysis_data()
+        # 同一字符串会出现在多个应用中，过滤结果按字符串缓存，每个不同的字符串只判断一次。
+        # 缓存持有绑定方法，与实例构成引用环，因此限制容量并在每次分析开始时清空
+        self._should_filter_string = functools.lru_cache(maxsize=FILTER_CACHE_SIZE)(self._should_filter_string)
+        if not lazy:
+            self.load_analysis_data()
+    
+    @property
+    def apps_data(self) -> Dict[str, Dict]:
+        """已加载的应用分析数据，按需加载"""
+        if self._apps_data is None:
+            self.load_analysis_data()
+        return self._apps_data
+    
+    @property
+    def analysis_files(self) -> List[Path]:
+        """分析目录中的应用分析文件（不解析内容）"""
+        if self._analysis_files is None:
+            if self.analysis_dir.exists():
+                self._analysis_files = [
+                    file_path for file_path in self.analysis_dir.glob("*_analysis.json")
+                    if file_path.name not in self.REPORT_FILES
+                ]
+            else:
+                self._analysis_files = []
+        return self._analysis_files
     
     def _init_common_words_filter(self):
-        """初始化常见开发词汇过滤器"""
-        # 编程通用词汇
-        programming_words = {
-            'main', 'error', 'com', 'index', 'app', 'application', 'system', 'data', 'info',
-            'debug', 'config', 'settings', 'default', 'value', 'key', 'name', 'type', 'size',
-            'count', 'number', 'string', 'text', 'file', 'path', 'url', 'http', 'https',
-            'www', 'api', 'json', 'xml', 'html', 'css', 'js', 'javascript', 'true', 'false',
-            'null', 'undefined', 'nil', 'empty', 'new', 'old', 'tmp', 'temp', 'cache',
-            'log', 'logs', 'trace', 'warn', 'warning', 'fatal', 'exception', 'status',
-            'state', 'flag', 'option', 'param', 'parameter', 'arg', 'argument', 'var',
-            'variable', 'function', 'method', 'class', 'object', 'instance', 'property',
-            'field', 'member', 'static', 'public', 'private', 'protected', 'internal'
-        }
+        """初始化常见开发词汇过滤器
         
-        # iOS/移动开发相关词汇
-        ios_words = {
-            'ios', 'iphone', 'ipad', 'apple', 'swift', 'objective', 'objc', 'xcode',
-            'foundation', 'uikit', 'core', 'framework', 'library', 'bundle', 'plist',
-            'nib', 'xib', 'storyboard', 'segue', 'view', 'controller', 'navigation',
-            'tab', 'table', 'collection', 'scroll', 'button', 'label', 'image', 'icon',
-            'background', 'foreground', 'animation', 'transition', 'gesture', 'touch',
-            'delegate', 'datasource', 'protocol', 'notification', 'observer', 'target',
-            'action', 'outlet', 'ibaction', 'iboutlet', 'autolayout', 'constraint',
-            'margin', 'padding', 'frame', 'bounds', 'center', 'origin', 'width', 'height'
-        }
-        
-        # 系统和框架词汇
-        system_words = {
-            'version', 'build', 'release', 'beta', 'alpha', 'production', 'development',
-            'test', 'testing', 'unit', 'integration', 'mock', 'stub', 'fake', 'sample',
-            'example', 'demo', 'tutorial', 'guide', 'help', 'support', 'documentation',
-            'readme', 'license', 'copyright', 'author', 'created', 'updated', 'modified',
-            'date', 'time', 'timestamp', 'uuid', 'identifier', 'id', 'uid', 'session',
-            'token', 'auth', 'authentication', 'authorization', 'login', 'logout',
-            'user', 'admin', 'guest', 'role', 'permission', 'access', 'security'
-        }
-        
-        # 网络和数据相关
-        network_words = {
-            'network', 'internet', 'connection', 'request', 'response', 'client', 'server',
-            'host', 'port', 'protocol', 'tcp', 'udp', 'socket', 'ssl', 'tls', 'certificate',
-            'encryption', 'hash', 'md5', 'sha', 'base64', 'encoding', 'decoding', 'utf8',
-            'ascii', 'unicode', 'locale', 'language', 'localization', 'internationalization',
-            'database', 'sql', 'sqlite', 'mysql', 'postgres', 'mongodb', 'redis', 'cache'
-        }
-        
-        # 通用技术词汇
-        tech_words = {
-            'algorithm', 'performance', 'optimization', 'memory', 'cpu', 'gpu', 'thread',
-            'queue', 'stack', 'heap', 'garbage', 'collection', 'reference', 'pointer',
-            'allocation', 'deallocation', 'leak', 'retain', 'release', 'autorelease',
-            'weak', 'strong', 'copy', 'mutable', 'immutable', 'readonly', 'readwrite'
-        }
-        
-        # 合并所有过滤词汇
-        self.common_words = programming_words | ios_words | system_words | network_words | tech_words
+        词表和正则表达式都是模块级常量，这里只绑定到实例属性
+        """
+        self.common_words = _COMMON_WORDS
         
         # 添加短字符串和数字模式
         self.min_meaningful_length = 3
         
-        # 编译正则表达式用于过滤
-        import re
-        self.number_pattern = re.compile(r'^\d+$')
-        self.version_pattern = re.compile(r'^\d+\.\d+(\.\d+)?$')
-        self.hex_pattern = re.compile(r'^[0-9a-fA-F]{8,}$')
-        self.uuid_pattern = re.compile(r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$')
-        self.path_pattern = re.compile(r'^/[a-zA-Z0-9/_.-]*$')
-        self.url_pattern = re.compile(r'^https?://')
-        self.domain_pattern = re.compile(r'.*\.(com|org|net|edu|gov|mil|int|co\.|app)$')
-        
-        # 技术性字符串过滤模式
-        self.swift_symbol_pattern = re.compile(r'^_\$s[A-Za-z0-9]+')  # Swift符号
-        self.objc_method_pattern = re.compile(r'^[@v]\d+@\d+:\d+')  # Objective-C方法签名
-        self.certificate_pattern = re.compile(r'Reliance on this certificate')  # 证书文本
-        self.plist_pattern = re.compile(r'^<!DOCTYPE plist')  # plist文件头
-        self.framework_pattern = re.compile(r'(WebView|WKWebView|UIKit|Foundation)')  # 框架相关
+        self.domain_pattern = _DOMAIN_PATTERN
+        self.format_pattern = _FORMAT_PATTERN
+        
+        self.error_keyword_pattern = _ERROR_KEYWORD_PATTERN
+        self.system_error_pattern = _SYSTEM_ERROR_PATTERN
+        self.ui_keyword_pattern = _UI_KEYWORD_PATTERN
+        self.chinese_ui_pattern = _CHINESE_UI_PATTERN
+        self.meaningful_words = _MEANINGFUL_WORDS
+        
+        self.technical_prefixes = _TECHNICAL_PREFIXES
+        self.technical_literal_pattern = _TECHNICAL_LITERAL_PATTERN
     
     def _should_filter_string(self, text: str) -> bool:
         """判断字符串是否应该被过滤
@@ -131,39 +283,19 @@ class SimilarityAnalyzer:
         if self._is_technical_string(text):
             return True
         
-        # 保留有意义的字符串
-        if self._is_meaningful_string(text):
-            return False
-        
-        # 转换为小写进行比较
+        # 转换为小写进行比较，后续检查共用同一个小写副本
         lower_text = text.lower()
         
-        # 过滤常见词汇（单个词）
-        if lower_text in self.common_words and len(text.split()) == 1:
-            return True
-        
-        # 过滤纯数字
-        if self.number_pattern.match(text):
-            return True
-        
-        # 过滤版本号
-        if self.version_pattern.match(text):
-            return True
-        
-        # 过滤长十六进制字符串（可能是哈希值）
-        if self.hex_pattern.match(text):
-            return True
-        
-        # 过滤UUID
-        if self.uuid_pattern.match(text):
-            return True
+        # 保留有意义的字符串
+        if self._is_meaningful_string(text, lower_text):
+            return False
         
-        # 过滤文件路径
-        if self.path_pattern.match(text):
+        # 过滤常见词汇（单个词）。词表中的词都不含空白，命中即说明是单个词，无需再切分
+        if lower_text in self.common_words:
             return True
         
-        # 过滤URL
-        if self.url_pattern.match(text):
+        # 过滤纯数字、版本号、长十六进制字符串（可能是哈希值）、UUID、文件路径和URL
+        if self.format_pattern.match(text):
             return True
         
         # 过滤域名
@@ -175,7 +307,7 @@ class SimilarityAnalyzer:
             return True
         
         # 过滤重复字符的字符串（如"aaaaa"）
-        if len(set(text.lower())) <= 2 and len(text) > 4:
+        if len(text) > 4 and len(set(lower_text)) <= 2:
             return True
         
         return False
@@ -183,35 +315,37 @@ class SimilarityAnalyzer:
     def _is_technical_string(self, text: str) -> bool:
         """判断是否为技术性字符串（应该被过滤）
         
+        各项检查之间是"或"的关系，先做只看首尾字符、长度和单字符计数的廉价检查，
+        最后才用合并后的子串正则扫描整个字符串
+        
         Args:
             text: 要检查的字符串
             
         Returns:
             bool: True表示是技术性字符串
         """
-        # Swift符号
-        if self.swift_symbol_pattern.match(text):
+        # 固定前缀（plist/XML头、框架前缀、@rpath、Swift内部符号、系统库路径）
+        if text.startswith(self.technical_prefixes):
             return True
         
+        first_char = text[:1]
+        
         # Objective-C方法签名（任何以@"或v开头且包含数字的）
         if text.startswith(('@"', 'v')) and any(c.isdigit() for c in text[:10]):
             return True
         
-        # 证书相关文本
-        if self.certificate_pattern.search(text):
+        # plist键值对
+        if first_char == '<' and text.startswith('<key>') and text.endswith('</key>'):
             return True
         
-        # plist文件头或XML声明
-        if text.startswith(('<!DOCTYPE', '<?xml')):
+        # 系统通知模式（以_开头且包含Notification的）
+        if first_char == '_' and ('Notification' in text or 'WillShow' in text or 'WillHide' in text):
             return True
         
-        # WebView相关的方法名（技术性API）
-        webview_methods = ['webView:', 'WKWebView', 'WKNavigation', 'WKContext']
-        if any(method in text for method in webview_methods):
-            return True
+        text_length = len(text)
         
         # 方法名模式（包含冒号的长字符串，通常是方法名）
-        if ':' in text and len(text) > 20:
+        if text_length > 20 and ':' in text:
             return True
         
         # 包含大量下划线的技术字符串
@@ -219,188 +353,134 @@ class SimilarityAnalyzer:
             return True
         
         # 全大写的长字符串（通常是常量或标识符）
-        if text.isupper() and len(text) > 8:
-            return True
-        
-        # 包含特殊符号组合的技术字符串
-        technical_symbols = ['@"', '@0:', 'v48@', 'v40@', 'v56@', '$s', '_$', '16@']
-        if any(symbol in text for symbol in technical_symbols):
-            return True
-        
-        # 包含Foundation、Core等框架前缀的字符串
-        framework_prefixes = ['Foundation', 'CoreData', 'CoreGraphics', 'UIKit', 'AVFoundation']
-        if any(text.startswith(prefix) or f'.{prefix}' in text for prefix in framework_prefixes):
-            return True
-        
-        # 框架路径和@rpath
-        if text.startswith('@rpath/') or '.framework/' in text:
-            return True
-        
-        # Swift内部符号
-        if text.startswith('_swift_'):
-            return True
-        
-        # plist键值对
-        if text.startswith('<key>') and text.endswith('</key>'):
-            return True
-        
-        # 证书相关文本
-        if 'Certificate' in text or 'Developer Relations' in text:
-            return True
-        
-        # iOS系统通知和常量
-        ios_system_patterns = [
-            '_UIApplication', '_NSNotification', 'UIApplicationMain',
-            'com.apple.developer', '#com.apple', 'NSArray element',
-            'Down-casted Array', 'Swift Array', 'failed to match'
-        ]
-        if any(pattern in text for pattern in ios_system_patterns):
-            return True
-        
-        # Objective-C和Swift运行时函数
-        runtime_patterns = [
-            '_objc_', 'swift_task_', 'swift_retain', 'swift_release',
-            'objc_msgSend', 'objc_retain', 'objc_autorelease'
-        ]
-        if any(pattern in text for pattern in runtime_patterns):
-            return True
-        
-        # 系统错误消息模式
-        system_error_patterns = [
-            'failed to match', 'cannot throw', 'reported an error',
-            'Thread Local Context', 'AutoreleasedReturnValue'
-        ]
-        if any(pattern in text for pattern in system_error_patterns):
-            return True
-        
-        # UI系统常量和通知
-        ui_system_patterns = [
-            '_UIKeyboard', '_NSForeground', '_NSBackground', 'AttributeName',
-            'LayoutDirection', 'StatusBarStyle', 'URLOptionsKey', 'ProxySettings',
-            'OrientationProvider', 'TextLayout', '_CFNetwork'
-        ]
-        if any(pattern in text for pattern in ui_system_patterns):
+        if text_length > 8 and text.isupper():
             return True
         
-        # Facebook SDK和第三方框架常量
-        sdk_patterns = [
-            '_FBSDK', 'AppEventParameterName', 'AppEventName', 'FacebookSDK'
-        ]
-        if any(pattern in text for pattern in sdk_patterns):
-            return True
-        
-        # 系统通知模式（以_开头且包含Notification的）
-        if text.startswith('_') and ('Notification' in text or 'WillShow' in text or 'WillHide' in text):
-            return True
-        
-        # 系统库路径
-        if text.startswith('/usr/lib/') or text.startswith('/System/Library/'):
-            return True
-        
-        # plist和XML相关
-        if text.startswith('<plist') or 'version="1.0"' in text or text.startswith('<?xml'):
-            return True
-        
-        # 系统调试和错误相关
-        system_debug_patterns = [
-            'debugDescription', 'radr://', '.cxx_destruct', 
-            'Apple Inc.', '_SKErrorDomain', 'radar://'
-        ]
-        if any(pattern in text for pattern in system_debug_patterns):
-            return True
-        
-        # 系统默认管理器和中心
-        system_managers = [
-            'standardUserDefaults', 'defaultManager', 'defaultCenter',
-            'sharedApplication', 'mainBundle', 'currentDevice'
-        ]
-        if any(manager in text for manager in system_managers):
+        # 长度过长的技术字符串（通常是代码符号）
+        if text_length > 60 and not any(c in text for c in ' .,!?'):
             return True
         
-        # 长度过长的技术字符串（通常是代码符号）
-        if len(text) > 60 and not any(c in text for c in ' .,!?'):
+        # 固定子串（Swift符号、证书文本、WebView/系统/运行时/SDK常量等），一次扫描完成
+        if self.technical_literal_pattern.search(text):
             return True
         
         return False
     
-    def _is_meaningful_string(self, text: str) -> bool:
+    def _is_meaningful_string(self, text: str, lower_text: str = None) -> bool:
         """判断字符串是否有意义（业务相关）
         
         Args:
             text: 要检查的字符串
+            lower_text: 调用方已计算的小写形式，未提供时在此计算
             
         Returns:
             bool: True表示有意义，应该保留
         """
-        lower_text = text.lower()
+        if lower_text is None:
+            lower_text = text.lower()
+        text_length = len(text)
         
         # 错误和警告消息（必须是完整的消息，不是单个词，且不是系统内部错误）
-        error_keywords = ['error', 'warning', 'fail', 'exception', 'invalid', 'missing', 'not found', 'denied']
-        if (any(keyword in lower_text for keyword in error_keywords) and 
+        if (self.error_keyword_pattern.search(lower_text) and
             len(text.split()) > 1 and
-            not any(sys_pattern in text for sys_pattern in ['NSArray', 'Swift Array', 'Down-casted', 'swift_task'])):
+            not self.system_error_pattern.search(text)):
             return True
         
         # 用户界面文本（包含常见UI词汇）
-        ui_keywords = ['button', 'click', 'tap', 'swipe', 'loading', 'success', 'cancel', 'confirm', 'ok', 'yes', 'no']
-        if any(keyword in lower_text for keyword in ui_keywords):
+        if self.ui_keyword_pattern.search(lower_text):
             return True
         
         # 包含冒号的消息（通常是状态或错误描述）
-        if ':' in text and len(text) > 10:
+        if text_length > 10 and ':' in text:
             return True
         
         # 包含感叹号或问号的字符串（用户提示）
-        if ('!' in text or '?' in text) and len(text) > 5:
+        if text_length > 5 and ('!' in text or '?' in text):
             return True
         
         # 包含"请"、"您"等中文用户提示
-        chinese_ui_chars = ['请', '您', '确认', '取消', '成功', '失败', '错误', '警告']
-        if any(char in text for char in chinese_ui_chars):
+        if self.chinese_ui_pattern.search(text):
             return True
         
-        # 包含多个单词的描述性文本
-        words = text.split()
-        if len(words) >= 3 and len(text) > 15:
+        # 包含多个单词的描述性文本，直接切分小写副本，不再逐词转换大小写
+        if text_length > 15:
+            words = lower_text.split()
             # 检查是否包含有意义的动词或形容词
-            meaningful_words = ['get', 'set', 'create', 'delete', 'update', 'load', 'save', 'send', 'receive', 
-                              'connect', 'disconnect', 'start', 'stop', 'play', 'pause', 'open', 'close']
-            if any(word.lower() in meaningful_words for word in words):
+            if len(words) >= 3 and not self.meaningful_words.isdisjoint(words):
                 return True
         
         return False
     
     def load_analysis_data(self):
         """加载分析数据"""
-        if not self.analysis_dir.exists():
-            return
-        
-        for file_path in self.analysis_dir.glob("*_analysis.json"):
-            if file_path.name == "similarity_analysis.json" or file_path.name == "comprehensive_similarity_analysis.json":
+        self._apps_data = {}
+        self._app_sources = {}
+        
+        files = self.analysis_files
+        if len(files) >= PARALLEL_LOAD_MIN_FILES:
+            # JSON解析受GIL限制，交给进程池并行解析，工作进程只传回精简后的数据
+            with ProcessPoolExecutor(max_workers=min(len(files), os.cpu_count() or 1)) as executor:
+                loaded = list(executor.map(_load_projected_analysis, files))
+        else:
+            loaded = [_load_projected_analysis(file_path) for file_path in files]
+        
+        for file_path, (app_name, data, error) in zip(files, loaded):
+            if error is not None:
+                print(f"警告: 加载分析文件失败 {file_path}: {error}")
                 continue
-                
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                app_name = data.get('app_info', {}).get('name', file_path.stem.replace('_analysis', ''))
-                
-                # 如果指定了目标应用列表，只加载指定的应用
-                if self.target_apps is None or app_name in self.target_apps:
-                    self.apps_data[app_name] = data
-                
-            except Exception as e:
-                print(f"警告: 加载分析文件失败 {file_path}: {e}")
+            
+            # 如果指定了目标应用列表，只加载指定的应用
+            if self.target_apps is None or app_name in self.target_apps:
+                self._apps_data[app_name] = data
+                self._app_sources[app_name] = file_path
+    
+    @staticmethod
+    def _project_analysis(data: Dict) -> Dict:
+        """只保留相似性分析用到的字段，其余数据（plist、资源统计、目录结构等）随加载结果一起释放
+        
+        Args:
+            data: 单个应用的完整分析结果
+            
+        Returns:
+            结构与分析结果相同、字段精简后的字典
+        """
+        app_info = data.get('app_info', {})
+        strings_data = data.get('strings', {})
+        resources_data = data.get('resources', {})
+        
+        resource_categories = {}
+        for category, file_list in resources_data.get('categories', {}).items():
+            if isinstance(file_list, list):
+                file_list = [
+                    {key: file_info[key] for key in ('name', 'size') if key in file_info}
+                    if isinstance(file_info, dict) else file_info
+                    for file_info in file_list
+                ]
+            resource_categories[category] = file_list
+        
+        return {
+            'app_info': {key: app_info[key] for key in ('name', 'bundle_id', 'version', 'file_size') if key in app_info},
+            'strings': {key: strings_data[key] for key in ('categories', 'total_strings', 'unique_strings')
+                        if key in strings_data},
+            'resources': {
+                'categories': resource_categories,
+                'total_files': resources_data.get('total_files', 0),
+                'total_size': resources_data.get('total_size', 0)
+            }
+        }
     
     def analyze_string_similarity(self) -> Dict:
         """分析字符串相似性"""
         if len(self.apps_data) < 2:
             return {"error": "需要至少2个应用才能进行相似性分析"}
         
-        # 提取所有应用的字符串
+        # 每次分析重新开始缓存过滤结果，避免缓存随多次分析持续占用内存
+        self._should_filter_string.cache_clear()
+        
+        # 提取所有应用的字符串，分析文件未变化时直接读取上次的提取结果
         app_strings = {}
         for app_name, data in self.apps_data.items():
-            strings = self._extract_all_strings(data)
+            strings = self._extract_all_strings_cached(app_name, data)
             app_strings[app_name] = strings
         
         # 分析重复字符串
@@ -417,7 +497,8 @@ class SimilarityAnalyzer:
             'similarity_matrix': similarity_matrix,
             'category_analysis': category_analysis,
             'apps_count': len(app_strings),
-            'total_unique_strings': len(set().union(*app_strings.values()))
+            # 去重后的字符串数已在重复分析中统计，无需再对所有集合求并集
+            'total_unique_strings': duplicate_analysis['statistics']['unique_strings']
         }
     
     def analyze_resource_similarity(self) -> Dict:
@@ -475,34 +556,118 @@ class SimilarityAnalyzer:
         
         return report
     
+    def save_report(self, report: Dict, output_path, pretty: bool = True):
+        """保存综合相似性报告
+        
+        安装了orjson时由orjson编码，重复字符串分组等大块数据逐段编码写入，
+        编码缓冲不会与整个报告同时驻留内存
+        
+        Args:
+            report: generate_comprehensive_report生成的报告
+            output_path: 输出文件路径
+            pretty: 是否缩进2格输出
+        """
+        dump_json_stream(report, output_path, pretty=pretty, depth=3)
+    
+    def _extract_all_strings_cached(self, app_name: str, data: Dict) -> Set[str]:
+        """提取应用的所有字符串，并在分析文件旁维护pickle缓存
+        
+        缓存以分析文件的修改时间、大小、过滤开关和过滤配置指纹为签名，签名一致时跳过逐字符串过滤
+        
+        Args:
+            app_name: 应用名称
+            data: 应用的分析数据
+        
+        Returns:
+            过滤后的字符串集合
+        """
+        source = self._app_sources.get(app_name)
+        if source is None:
+            return self._extract_all_strings(data)
+        
+        cache_path = source.with_suffix('.strings.pkl')
+        try:
+            stat = source.stat()
+            signature = (STRINGS_CACHE_VERSION, stat.st_mtime_ns, stat.st_size, self.filter_common_words,
+                         self._get_filter_fingerprint())
+        except OSError:
+            return self._extract_all_strings(data)
+        
+        try:
+            with open(cache_path, 'rb') as f:
+                cached_signature, cached_strings = pickle.load(f)
+            if cached_signature == signature:
+                # 反序列化得到的是新字符串对象，重新驻留以便各应用共享
+                return {sys.intern(string) for string in cached_strings}
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+            pass  # 缓存不存在或已损坏，重新提取
+        
+        strings = self._extract_all_strings(data)
+        
+        dump_pickle_atomic((signature, strings), cache_path)
+        
+        return strings
+    
+    def _get_filter_fingerprint(self) -> str:
+        """计算过滤配置指纹
+        
+        涵盖分析器类名、跳过的字符串类别、过滤词表和正则，以及过滤相关方法的代码，
+        修改任一过滤规则或由子类覆盖过滤方法时，旧的字符串缓存自动失效
+        
+        Returns:
+            十六进制指纹
+        """
+        if self._filter_fingerprint is None:
+            cls = type(self)
+            parts = [
+                f"{cls.__module__}.{cls.__qualname__}",
+                _stable_repr(self.SKIPPED_STRING_CATEGORIES),
+            ]
+            parts.extend(_stable_repr(getattr(self, name)) for name in _FILTER_ATTRIBUTES)
+            parts.extend(_stable_repr(getattr(cls, name).__code__) for name in _FILTER_METHODS)
+            self._filter_fingerprint = hashlib.blake2b('\n'.join(parts).encode('utf-8'), digest_size=16).hexdigest()
+        return self._filter_fingerprint
+    
     def _extract_all_strings(self, data: Dict) -> Set[str]:
-        """提取应用的所有字符串"""
+        """提取应用的所有字符串，相同内容在多个应用间共享同一个字符串对象"""
         strings = set()
+        # 循环内用到的属性和方法先取到局部变量
+        add = strings.add
+        should_filter = self._should_filter_string
+        intern = sys.intern
         
         strings_data = data.get('strings', {})
         categories = strings_data.get('categories', {})
         
         for category, string_list in categories.items():
             # 跳过uncategorized、domains和class_methods类型的字符串
-            if category.lower() in ['uncategorized', 'domains', 'class_methods']:
+            if category.lower() in self.SKIPPED_STRING_CATEGORIES:
                 continue
+            
+            if type(string_list) is not list:
+                continue
+            
+            for item in string_list:
+                # 分析结果由JSON解析得到，类型判断用type比isinstance更快
+                if type(item) is str:
+                    string_content = item
+                elif type(item) is dict:
+                    string_content = item.get('content')
+                else:
+                    continue
                 
-            if isinstance(string_list, list):
-                for item in string_list:
-                    string_content = None
-                    if isinstance(item, str):
-                        string_content = item
-                    elif isinstance(item, dict) and 'content' in item:
-                        string_content = item['content']
-                    
-                    # 应用过滤逻辑
-                    if string_content and not self._should_filter_string(string_content):
-                        strings.add(string_content)
+                # 应用过滤逻辑
+                if string_content and not should_filter(string_content):
+                    add(intern(string_content))
         
         return strings
     
-    def _extract_resources(self, data: Dict) -> List[Dict]:
-        """提取应用的资源信息"""
+    def _extract_resources(self, data: Dict) -> List[Tuple[str, int, str]]:
+        """提取应用的资源信息
+        
+        每个资源只保留比较用到的字段，以(文件名, 大小, 类别)元组表示，
+        资源数量大时比逐个构建字典省内存
+        """
         resources = []
         
         resources_data = data.get('resources', {})
@@ -510,15 +675,10 @@ class SimilarityAnalyzer:
         
         for category, file_list in categories.items():
             if isinstance(file_list, list):
+                category = sys.intern(category)
                 for file_info in file_list:
                     if isinstance(file_info, dict):
-                        resource = {
-                            'name': file_info.get('name', ''),
-                            'size': file_info.get('size', 0),
-                            'category': category,
-                            'path': file_info.get('path', '')
-                        }
-                        resources.append(resource)
+                        resources.append((sys.intern(file_info.get('name', '')), file_info.get('size', 0), category))
         
         return resources
     
@@ -526,31 +686,31 @@ class SimilarityAnalyzer:
         """分析重复字符串"""
         # 统计每个字符串出现在多少个应用中
         string_count = Counter()
-        string_apps = defaultdict(list)
+        for strings in app_strings.values():
+            string_count.update(strings)
         
+        # 只为重复的字符串收集所属应用：每个应用的字符串集合与重复字符串求一次交集，
+        # 不再为每个重复字符串逐个检查所有应用
+        string_apps = {string: [] for string, count in string_count.items() if count > 1}
         for app_name, strings in app_strings.items():
-            for string in strings:
-                string_count[string] += 1
+            for string in strings.intersection(string_apps):
                 string_apps[string].append(app_name)
         
-        # 按重复次数分组
+        # 按重复次数分组，重复次数即所属应用数
+        # 组内保持统计顺序，展示用的最长字符串在取前N个时再按长度选出
         duplicates = defaultdict(list)
-        for string, count in string_count.items():
-            if count > 1:
-                duplicates[count].append({
-                    'content': string,
-                    'apps': string_apps[string],
-                    'count': count
-                })
-        
-        # 排序重复字符串
-        for count in duplicates:
-            duplicates[count].sort(key=lambda x: len(x['content']), reverse=True)
+        for string, apps in string_apps.items():
+            count = len(apps)
+            duplicates[count].append({
+                'content': string,
+                'apps': apps,
+                'count': count
+            })
         
         # 统计信息
         total_strings = sum(len(strings) for strings in app_strings.values())
         unique_strings = len(string_count)
-        duplicate_strings = sum(count - 1 for count in string_count.values() if count > 1)
+        duplicate_strings = sum(len(apps) - 1 for apps in string_apps.values())
         
         return {
             'duplicates_by_count': dict(duplicates),
@@ -563,31 +723,31 @@ class SimilarityAnalyzer:
             'top_duplicates': self._get_top_duplicates(duplicates, 20)
         }
     
-    def _analyze_resource_duplicates(self, app_resources: Dict[str, List[Dict]]) -> Dict:
+    def _analyze_resource_duplicates(self, app_resources: Dict[str, List[Tuple[str, int, str]]]) -> Dict:
         """分析重复资源"""
-        # 按文件名和大小分组
-        resource_groups = defaultdict(list)
-        
+        # 一次遍历按(文件名, 大小)分组，记录首次出现的类别和所属应用
+        resource_groups = {}
         for app_name, resources in app_resources.items():
-            for resource in resources:
-                key = (resource['name'], resource['size'])
-                resource_groups[key].append({
-                    'app': app_name,
-                    'category': resource['category'],
-                    'path': resource['path']
-                })
-        
-        # 找出重复的资源
+            for name, size, category in resources:
+                key = (name, size)
+                group = resource_groups.get(key)
+                if group is None:
+                    resource_groups[key] = (category, [app_name])
+                else:
+                    group[1].append(app_name)
+        
+        # 找出重复的资源，出现次数即所属应用列表的长度
         duplicates = {}
-        for (name, size), resources in resource_groups.items():
-            if len(resources) > 1:
-                duplicates[f"{name}_{size}"] = {
-                    'name': name,
-                    'size': size,
-                    'apps': [r['app'] for r in resources],
-                    'count': len(resources),
-                    'category': resources[0]['category']
-                }
+        for (name, size), (category, apps) in resource_groups.items():
+            if len(apps) < 2:
+                continue
+            duplicates[f"{name}_{size}"] = {
+                'name': name,
+                'size': size,
+                'apps': apps,
+                'count': len(apps),
+                'category': category
+            }
         
         return {
             'duplicate_resources': duplicates,
@@ -599,23 +759,36 @@ class SimilarityAnalyzer:
         }
     
     def _calculate_similarity_matrix(self, app_strings: Dict[str, Set[str]]) -> Dict:
-        """计算应用间相似度矩阵"""
+        """计算应用间相似度矩阵
+        
+        各应用的字符串集合先编码为位图，交集大小由按位与后的置位数得出，
+        避免对每对应用重复做集合求交。位图只覆盖被多个应用共享的字符串，
+        长度与共享词表成正比，而不是与全部字符串数成正比
+        """
         app_names = list(app_strings.keys())
-        similarity_matrix = {}
-        
-        for i, app1 in enumerate(app_names):
-            similarity_matrix[app1] = {}
-            for j, app2 in enumerate(app_names):
-                if i <= j:  # 只计算上三角矩阵
-                    similarity = self._calculate_jaccard_similarity(
-                        app_strings[app1], 
-                        app_strings[app2]
-                    )
-                    similarity_matrix[app1][app2] = similarity
-                    if app1 != app2:
-                        if app2 not in similarity_matrix:
-                            similarity_matrix[app2] = {}
-                        similarity_matrix[app2][app1] = similarity
+        bitsets = build_membership_bitsets(app_strings, shared_only=True)
+        
+        # 先按应用顺序占好每行的键，保证对称填充后各行的键顺序与应用顺序一致
+        similarity_matrix = {app_name: dict.fromkeys(app_names) for app_name in app_names}
+        
+        # 位图不含各应用独有的字符串，集合与自身的相似度直接取1
+        for app_name in app_names:
+            similarity_matrix[app_name][app_name] = 1.0
+        
+        # 各应用的字符串数只取一次，配合容斥原理求并集大小
+        sizes = {app_name: len(strings) for app_name, strings in app_strings.items()}
+        
+        for app1, app2 in combinations(app_names, 2):
+            size1 = sizes[app1]
+            size2 = sizes[app2]
+            if not size1 and not size2:
+                similarity = 1.0
+            else:
+                intersection = popcount(bitsets[app1] & bitsets[app2])
+                union = size1 + size2 - intersection
+                similarity = intersection / union if union > 0 else 0.0
+            similarity_matrix[app1][app2] = similarity
+            similarity_matrix[app2][app1] = similarity
         
         return similarity_matrix
     
@@ -624,8 +797,11 @@ class SimilarityAnalyzer:
         if not set1 and not set2:
             return 1.0
         
+        # 由较小的集合发起求交，并集大小由容斥原理得出，无需构建并集
+        if len(set1) > len(set2):
+            set1, set2 = set2, set1
         intersection = len(set1.intersection(set2))
-        union = len(set1.union(set2))
+        union = len(set1) + len(set2) - intersection
         
         return intersection / union if union > 0 else 0.0
     
@@ -645,14 +821,12 @@ class SimilarityAnalyzer:
         
         return category_analysis
     
-    def _analyze_resource_types(self, app_resources: Dict[str, List[Dict]]) -> Dict:
+    def _analyze_resource_types(self, app_resources: Dict[str, List[Tuple[str, int, str]]]) -> Dict:
         """分析资源类型分布"""
         type_analysis = {}
         
         for app_name, resources in app_resources.items():
-            type_stats = defaultdict(int)
-            for resource in resources:
-                type_stats[resource['category']] += 1
+            type_stats = Counter(category for _, _, category in resources)
             
             type_analysis[app_name] = dict(type_stats)
         
@@ -697,19 +871,20 @@ class SimilarityAnalyzer:
         for count, items in duplicates_by_count.items():
             stats['duplication_distribution'][f"{count}_apps"] = len(items)
         
-        # 找出最重复的字符串
-        all_duplicates = []
-        for count, items in duplicates_by_count.items():
-            all_duplicates.extend([(int(count), item) for item in items])
-        
-        all_duplicates.sort(key=lambda x: x[0], reverse=True)
+        # 找出最重复的字符串。重复分析已按同样的顺序选出了前20个，直接取其前10个，
+        # 只有缺少该结果时才重新从分组中选取
+        top_duplicates = dup_analysis.get('top_duplicates')
+        if top_duplicates is not None:
+            top_items = ((item['count'], item) for item in top_duplicates[:10])
+        else:
+            top_items = self._iter_duplicates_by_count(duplicates_by_count, 10)
         stats['most_duplicated_strings'] = [
             {
                 'content': item['content'],
                 'count': count,
                 'apps': item['apps']
             }
-            for count, item in all_duplicates[:10]
+            for count, item in top_items
         ]
         
         return stats
@@ -792,32 +967,44 @@ class SimilarityAnalyzer:
         
         # 相似度建议
         if 'similarity_matrix' in string_analysis:
-            # 找出高相似度的应用对
+            # 矩阵是对称的，只需检查上三角，找到一对高相似度应用即可
             matrix = string_analysis['similarity_matrix']
-            high_similarity_pairs = []
-            
-            for app1, similarities in matrix.items():
-                for app2, similarity in similarities.items():
-                    if app1 != app2 and similarity > 0.8:
-                        high_similarity_pairs.append((app1, app2, similarity))
+            has_high_similarity = any(
+                matrix[app1].get(app2, 0) > 0.8
+                for app1, app2 in combinations(matrix, 2)
+            )
             
-            if high_similarity_pairs:
+            if has_high_similarity:
                 recommendations.append("发现高相似度应用，建议检查是否可以合并或提取公共组件")
         
         return recommendations
     
     def _get_top_duplicates(self, duplicates: Dict, limit: int = 20) -> List[Dict]:
-        """获取最重复的字符串"""
-        all_duplicates = []
+        """获取最重复的字符串，按重复次数和字符串长度降序"""
+        return [item for _, item in self._iter_duplicates_by_count(duplicates, limit)]
+    
+    @staticmethod
+    def _iter_duplicates_by_count(duplicates: Dict, limit: int):
+        """按重复次数从高到低依次取出重复字符串
         
-        for count, items in duplicates.items():
-            for item in items:
-                all_duplicates.append((int(count), item))
+        同一重复次数内按字符串长度降序，每组只用堆选出还需要的条目，
+        不必对整组排序
         
-        # 按重复次数和字符串长度排序
-        all_duplicates.sort(key=lambda x: (x[0], len(x[1]['content'])), reverse=True)
+        Args:
+            duplicates: 按重复次数分组的重复字符串
+            limit: 最多取出的数量
         
-        return [item for _, item in all_duplicates[:limit]]
+        Yields:
+            (重复次数, 重复字符串条目) 元组
+        """
+        remaining = limit
+        for count in sorted(duplicates, key=int, reverse=True):
+            if remaining <= 0:
+                return
+            top_items = heapq.nlargest(remaining, duplicates[count], key=lambda item: len(item['content']))
+            remaining -= len(top_items)
+            for item in top_items:
+                yield int(count), item
     
     def _get_timestamp(self) -> str:
         """获取时间戳"""
@@ -882,4 +1069,21 @@ class SimilarityAnalyzer:
             for i, rec in enumerate(recommendations, 1):
                 print(f"   {i}. {rec}")
         
-        print("=" * 60) 
\ No newline at end of file
+        print("=" * 60) 
+
+
+def _load_projected_analysis(file_path: Path) -> Tuple[str, Dict, str]:
+    """加载单个分析文件并精简字段，可在工作进程中调用
+    
+    Args:
+        file_path: 分析文件路径
+    
+    Returns:
+        (应用名称, 精简后的分析数据, 错误信息) 元组，加载成功时错误信息为None
+    """
+    try:
+        data = load_json_cached(file_path)
+        app_name = data.get('app_info', {}).get('name', file_path.stem.replace('_analysis', ''))
+        return app_name, SimilarityAnalyzer._project_analysis(data), None
+    except Exception as e:
+        return None, None, str(e)
@@ -5,10 +5,20 @@
 
 import re
 import os
+import sys
+import mmap
+import codecs
 from collections import Counter, defaultdict
 from typing import List, Dict, Set
 
 
+# UTF-8增量解码时每块的字节数
+UTF8_DECODE_CHUNK_SIZE = 1024 * 1024
+
+# 定位块内最后一个分隔字符时优先搜索的块尾字符数
+UTF8_BOUNDARY_WINDOW = 4096
+
+
 class StringExtractor:
     """字符串提取器"""
     
@@ -25,12 +35,19 @@ class StringExtractor:
             'errors': re.compile(r'(?i)(error|failed|exception|invalid|warning|alert|fault)', re.IGNORECASE),
             'bundle_ids': re.compile(r'[a-zA-Z][a-zA-Z0-9]*\.[a-zA-Z][a-zA-Z0-9]*\.[a-zA-Z][a-zA-Z0-9]*'),
             'file_paths': re.compile(r'[./][^\s\x00-\x1f\x7f-\x9f]*\.(png|jpg|jpeg|gif|mp3|wav|m4a|json|plist|xml|txt|pdf)', re.IGNORECASE),
-            'domains': re.compile(r'[a-zA-Z0-9][a-zA-Z0-9-]*[a-zA-Z0-9]*\.[a-zA-Z]{2,}'),
+            # [a-zA-Z0-9-]* 已覆盖结尾的字母数字，不再叠加量词以免大量回溯
+            'domains': re.compile(r'[a-zA-Z0-9][a-zA-Z0-9-]*\.[a-zA-Z]{2,}'),
             'email': re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'),
             'version': re.compile(r'\d+\.\d+(\.\d+)?'),
             'coordinates': re.compile(r'-?\d+\.\d+,-?\d+\.\d+'),
             'numbers': re.compile(r'\b\d{4,}\b'),  # 4位及以上的数字
         }
+        
+        # 提取用的正则依赖最小长度，每个实例只编译一次
+        self._ascii_pattern = re.compile(rb'[\x20-\x7e]{%d,}' % min_length)
+        self._utf8_pattern = re.compile(r'[\u0020-\u007E\u00A0-\uFFFF]{%d,}' % min_length)
+        # 最后一个分隔字符：其后直到末尾都是可匹配字符，向前搜索即可定位，无需反转复制
+        self._utf8_last_boundary = re.compile(r'[^\u0020-\u007E\u00A0-\uFFFF](?=[\u0020-\u007E\u00A0-\uFFFF]*\Z)')
     
     def analyze(self, binary_path: str) -> Dict:
         """分析二进制文件中的字符串
@@ -44,23 +61,31 @@ class StringExtractor:
         # 提取字符串
         strings = self.extract_strings(binary_path)
         
+        return self._build_result(strings, os.path.getsize(binary_path))
+    
+    def _build_result(self, strings: List[str], binary_size: int) -> Dict:
+        """根据提取的字符串生成分析结果"""
         # 分类字符串
         categorized = self.categorize_strings(strings)
         
+        # 出现次数只统计一次，唯一数量、重复查找和高频字符串共用
+        counter = Counter(strings)
+        unique_count = len(counter)
+        
         # 统计信息
-        stats = self.calculate_statistics(strings, categorized)
+        stats = self.calculate_statistics(strings, categorized, unique_count)
         
         # 查找重复
-        duplicates = self.find_duplicates(strings)
+        duplicates = self.find_duplicates(strings, counter)
         
         return {
             'total_strings': len(strings),
-            'unique_strings': len(set(strings)),
+            'unique_strings': unique_count,
             'statistics': stats,
             'categories': categorized,
             'duplicates': duplicates,
-            'top_strings': self.get_top_strings(strings, 20),
-            'binary_size': os.path.getsize(binary_path)
+            'top_strings': self.get_top_strings(strings, 20, counter),
+            'binary_size': binary_size
         }
     
     def extract_strings(self, binary_path: str) -> List[str]:
@@ -72,81 +97,109 @@ class StringExtractor:
         Returns:
             提取的字符串列表
         """
-        strings = []
-        
         try:
             with open(binary_path, 'rb') as f:
-                data = f.read()
-                
-                # 提取ASCII字符串
-                strings.extend(self._extract_ascii_strings(data))
-                
-                # 提取UTF-8字符串
-                strings.extend(self._extract_utf8_strings(data))
+                # 空文件无法建立内存映射
+                if os.fstat(f.fileno()).st_size == 0:
+                    return self.extract_strings_from_buffer(b'')
                 
+                # 通过内存映射扫描，避免把整个二进制文件读入内存
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if hasattr(mm, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+                        mm.madvise(mmap.MADV_SEQUENTIAL)
+                    return self.extract_strings_from_buffer(mm)
         except Exception as e:
             print(f"警告: 读取二进制文件时出错: {e}")
+            return []
+    
+    def extract_strings_from_buffer(self, data) -> List[str]:
+        """从内存中的二进制数据提取字符串
         
-        # 去重并过滤
-        unique_strings = list(set(strings))
-        filtered_strings = [s for s in unique_strings if len(s) >= self.min_length and self._is_valid_string(s)]
+        Args:
+            data: 支持缓冲区协议的对象（bytes、mmap等）
         
-        return filtered_strings
-    
-    def _extract_ascii_strings(self, data: bytes) -> List[str]:
-        """提取ASCII字符串"""
+        Returns:
+            提取的字符串列表
+        """
         strings = []
-        current_string = ""
         
-        for byte in data:
-            if 32 <= byte <= 126:  # 可打印ASCII字符
-                current_string += chr(byte)
-            else:
-                if len(current_string) >= self.min_length:
-                    strings.append(current_string)
-                current_string = ""
+        with memoryview(data) as view:
+            # 提取ASCII字符串
+            strings.extend(self._extract_ascii_strings(view))
+            
+            # 提取UTF-8字符串
+            strings.extend(self._extract_utf8_strings(view))
         
-        # 处理最后一个字符串
-        if len(current_string) >= self.min_length:
-            strings.append(current_string)
+        # 去重并过滤，驻留后与其他二进制及后续分析中的相同内容共享同一对象
+        unique_strings = list(set(strings))
+        filtered_strings = [sys.intern(s) for s in unique_strings if len(s) >= self.min_length and self._is_valid_string(s)]
         
-        return strings
+        return filtered_strings
     
-    def _extract_utf8_strings(self, data: bytes) -> List[str]:
-        """提取UTF-8字符串"""
-        strings = []
+    def _extract_ascii_strings(self, data) -> List[str]:
+        """提取ASCII字符串
         
-        try:
-            # 尝试解码整个文件为UTF-8
-            text = data.decode('utf-8', errors='ignore')
-            
-            # 使用正则表达式提取有意义的字符串
-            pattern = re.compile(r'[\u0020-\u007E\u00A0-\uFFFF]{' + str(self.min_length) + ',}')
-            utf8_strings = pattern.findall(text)
+        由正则引擎在字节层面扫描连续的可打印ASCII字符（0x20-0x7E），
+        避免逐字节拼接Python字符串
+        """
+        return [run.decode('ascii') for run in self._ascii_pattern.findall(data)]
+    
+    def _extract_utf8_strings(self, data) -> List[str]:
+        """提取UTF-8字符串
+        
+        按块增量解码，不再为整个二进制文件生成一份Unicode副本。
+        每块末尾尚未结束的字符串会留到下一块拼接后再匹配，
+        结果与整体解码后匹配完全一致
+        """
+        strings = []
+        pattern = self._utf8_pattern
+        last_boundary = self._utf8_last_boundary
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+        # 尚未遇到分隔字符的片段，按块暂存，遇到分隔字符时才拼接，避免反复复制长字符串
+        pending = []
+        
+        for start in range(0, len(data), UTF8_DECODE_CHUNK_SIZE):
+            text = decoder.decode(data[start:start + UTF8_DECODE_CHUNK_SIZE])
             
-            strings.extend(utf8_strings)
+            # 找到本块最后一个分隔字符，之后的部分可能与下一块相连。
+            # 分隔字符通常就在块尾附近，先只搜索末尾一段，找不到再搜索整块
+            last = last_boundary.search(text, max(0, len(text) - UTF8_BOUNDARY_WINDOW))
+            if last is None and len(text) > UTF8_BOUNDARY_WINDOW:
+                last = last_boundary.search(text)
+            if last is None:
+                pending.append(text)
+                continue
             
-        except Exception:
-            pass  # 忽略UTF-8解码错误
+            cut = last.end()
+            pending.append(text[:cut])
+            strings.extend(pattern.findall(''.join(pending)))
+            pending = [text[cut:]]
+        
+        pending.append(decoder.decode(b'', final=True))
+        strings.extend(pattern.findall(''.join(pending)))
         
         return strings
     
     def _is_valid_string(self, s: str) -> bool:
-        """检查字符串是否有效"""
-        # 排除全是重复字符的字符串
-        if len(set(s)) == 1:
-            return False
-        
-        # 排除过多非打印字符的字符串
-        printable_count = sum(1 for c in s if c.isprintable())
-        if printable_count / len(s) < 0.8:
-            return False
+        """检查字符串是否有效
         
+        先做长度判断，再用C层的 str.count / str.isprintable 完成整串检查，
+        只有含不可打印字符时才逐字符统计
+        """
         # 排除过长的字符串（可能是数据）
         if len(s) > 1000:
             return False
         
-        return True
+        # 排除全是重复字符的字符串
+        if s.count(s[:1]) == len(s):
+            return False
+        
+        # 排除过多非打印字符的字符串（ASCII提取结果全部可打印，直接通过）
+        if s.isprintable():
+            return True
+        
+        printable_count = sum(1 for c in s if c.isprintable())
+        return printable_count / len(s) >= 0.8
     
     def categorize_strings(self, strings: List[str]) -> Dict[str, List[str]]:
         """对字符串进行分类
@@ -159,13 +212,14 @@ class StringExtractor:
         """
         categories = defaultdict(list)
         uncategorized = []
+        searches = [(category, pattern.search) for category, pattern in self.string_patterns.items()]
         
         for string in strings:
             categorized = False
             
             # 检查每个模式
-            for category, pattern in self.string_patterns.items():
-                if pattern.search(string):
+            for category, search in searches:
+                if search(string):
                     categories[category].append(string)
                     categorized = True
                     break  # 只分配到第一个匹配的类别
@@ -187,7 +241,7 @@ class StringExtractor:
         # 转换为普通字典并排序
         result = {}
         for category, strings_list in categories.items():
-            result[category] = sorted(list(set(strings_list)))
+            result[category] = sorted(set(strings_list))
         
         return result
     
@@ -225,38 +279,44 @@ class StringExtractor:
         
         return False
     
-    def calculate_statistics(self, strings: List[str], categorized: Dict[str, List[str]]) -> Dict:
-        """计算字符串统计信息"""
+    def calculate_statistics(self, strings: List[str], categorized: Dict[str, List[str]], unique_count: int = None) -> Dict:
+        """计算字符串统计信息
+        
+        Args:
+            strings: 字符串列表
+            categorized: 分类结果
+            unique_count: 已知的唯一字符串数量，为None时根据strings重新计算
+        
+        Returns:
+            统计信息
+        """
         if not strings:
             return {}
         
-        lengths = [len(s) for s in strings]
+        if unique_count is None:
+            unique_count = len(set(strings))
+        
+        lengths = list(map(len, strings))
+        total_chars = sum(lengths)
         
         stats = {
             'length_stats': {
                 'min': min(lengths),
                 'max': max(lengths),
-                'avg': sum(lengths) / len(lengths),
-                'total_chars': sum(lengths)
+                'avg': total_chars / len(lengths),
+                'total_chars': total_chars
             },
             'category_counts': {category: len(strings_list) for category, strings_list in categorized.items()},
             'encoding_info': self._analyze_encoding(strings),
-            'duplicate_rate': (len(strings) - len(set(strings))) / len(strings) if strings else 0
+            'duplicate_rate': (len(strings) - unique_count) / len(strings)
         }
         
         return stats
     
     def _analyze_encoding(self, strings: List[str]) -> Dict:
         """分析字符串编码信息"""
-        ascii_count = 0
-        unicode_count = 0
-        
-        for s in strings:
-            try:
-                s.encode('ascii')
-                ascii_count += 1
-            except UnicodeEncodeError:
-                unicode_count += 1
+        ascii_count = sum(1 for s in strings if s.isascii())
+        unicode_count = len(strings) - ascii_count
         
         return {
             'ascii_strings': ascii_count,
@@ -264,22 +324,39 @@ class StringExtractor:
             'ascii_percentage': ascii_count / len(strings) if strings else 0
         }
     
-    def find_duplicates(self, strings: List[str]) -> Dict:
-        """查找重复字符串"""
-        counter = Counter(strings)
-        duplicates = {string: count for string, count in counter.items() if count > 1}
+    def find_duplicates(self, strings: List[str], counter: Counter = None) -> Dict:
+        """查找重复字符串
         
-        # 按出现次数排序
-        sorted_duplicates = dict(sorted(duplicates.items(), key=lambda x: x[1], reverse=True))
+        Args:
+            strings: 字符串列表
+            counter: 已统计好的出现次数，为None时根据strings重新统计
+        
+        Returns:
+            重复字符串信息
+        """
+        if counter is None:
+            counter = Counter(strings)
+        # most_common与按次数稳定降序排序的结果一致，出现多次的字符串排在最前
+        top_duplicates = {string: count for string, count in counter.most_common(50) if count > 1}
         
         return {
-            'count': len(duplicates),
-            'strings': dict(list(sorted_duplicates.items())[:50])  # 限制返回前50个
+            'count': sum(1 for count in counter.values() if count > 1),
+            'strings': top_duplicates  # 限制返回前50个
         }
     
-    def get_top_strings(self, strings: List[str], limit: int = 20) -> List[Dict]:
-        """获取最常见的字符串"""
-        counter = Counter(strings)
+    def get_top_strings(self, strings: List[str], limit: int = 20, counter: Counter = None) -> List[Dict]:
+        """获取最常见的字符串
+        
+        Args:
+            strings: 字符串列表
+            limit: 返回数量
+            counter: 已统计好的出现次数，为None时根据strings重新统计
+        
+        Returns:
+            字符串及出现次数列表
+        """
+        if counter is None:
+            counter = Counter(strings)
         top_strings = counter.most_common(limit)
         
         return [{'string': string, 'count': count} for string, count in top_strings] 
\ No newline at end of file
@@ -4,9 +4,23 @@
 """
 
 import os
+import re
+import json
+import pickle
 import hashlib
+import functools
+from collections import Counter
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Any
+
+try:
+    import orjson
+except ImportError:  # orjson为可选依赖，缺失时回退到标准库json
+    orjson = None
+
+
+# 计算文件哈希时每次读取的字节数
+HASH_CHUNK_SIZE = 1024 * 1024
 
 
 def calculate_file_hash(file_path: str, algorithm: str = 'md5') -> str:
@@ -23,13 +37,252 @@ def calculate_file_hash(file_path: str, algorithm: str = 'md5') -> str:
     
     try:
         with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b""):
+            # Python 3.11+ 由hashlib在C层循环读取并计算
+            if hasattr(hashlib, 'file_digest'):
+                return hashlib.file_digest(f, lambda: hash_obj).hexdigest()
+            
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
                 hash_obj.update(chunk)
-        return hash_obj.hexdigest()
+            return hash_obj.hexdigest()
     except Exception:
         return ""
 
 
+# JSON解析缓存的格式版本，缓存结构变化时递增使旧缓存失效
+JSON_CACHE_VERSION = 1
+
+
+def load_json(file_path) -> Any:
+    """读取JSON文件
+    
+    以二进制方式读取后直接解析，安装了orjson时使用orjson加速
+    
+    Args:
+        file_path: JSON文件路径
+    
+    Returns:
+        解析后的数据
+    """
+    return parse_json(Path(file_path).read_bytes())
+
+
+def parse_json(raw: bytes) -> Any:
+    """解析JSON字节串，安装了orjson时使用orjson加速
+    
+    Args:
+        raw: UTF-8编码的JSON内容
+    
+    Returns:
+        解析后的数据
+    """
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def load_json_cached(file_path) -> Any:
+    """读取JSON文件，并在同目录下维护pickle缓存
+    
+    缓存以JSON文件的修改时间（纳秒）和大小为签名，签名完全一致时直接反序列化缓存，
+    跳过JSON解析。恢复旧文件时修改时间可能早于缓存，因此不比较先后，只比较是否相等
+    
+    Args:
+        file_path: JSON文件路径
+    
+    Returns:
+        解析后的数据
+    """
+    json_path = Path(file_path)
+    cache_path = json_path.with_suffix('.pkl')
+    
+    try:
+        stat = json_path.stat()
+    except OSError:
+        return load_json(json_path)
+    signature = (JSON_CACHE_VERSION, stat.st_mtime_ns, stat.st_size)
+    
+    try:
+        with open(cache_path, 'rb') as f:
+            cached_signature, cached_data = pickle.load(f)
+        if cached_signature == signature:
+            return cached_data
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+        pass  # 缓存不存在或已损坏，重新解析
+    
+    data = load_json(json_path)
+    dump_pickle_atomic((signature, data), cache_path)
+    
+    return data
+
+
+def dump_pickle_atomic(data: Any, file_path) -> None:
+    """写入pickle缓存文件
+    
+    先写入同目录下的临时文件再替换目标文件，并发运行时不会读到写了一半的缓存。
+    缓存写入失败不影响结果，因此出错时只清理临时文件，不抛出异常
+    
+    Args:
+        data: 要写入的数据
+        file_path: 缓存文件路径
+    """
+    cache_path = Path(file_path)
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+
+
+def _encode_json(data: Any, pretty: bool) -> bytes:
+    """将数据编码为UTF-8 JSON字节串，安装了orjson时优先使用"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option)
+    if pretty:
+        return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def dump_json(data: Any, file_path, pretty: bool = True):
+    """写入JSON文件（UTF-8）
+    
+    安装了orjson时使用orjson编码，输出经64KB缓冲一次写入
+    
+    Args:
+        data: 要写入的数据
+        file_path: 输出文件路径
+        pretty: 是否缩进2格输出，为False时输出紧凑格式
+    """
+    payload = _encode_json(data, pretty)
+    
+    with open(file_path, 'wb', buffering=65536) as f:
+        f.write(payload)
+
+
+def dump_json_stream(data: Any, file_path, pretty: bool = True, depth: int = 2):
+    """分段编码写入JSON文件，输出内容与dump_json一致
+    
+    顶部depth层字典逐个键编码写入，更深层的值整体编码，
+    编码缓冲的峰值只有最大的单个分段大小，而不是整个文档
+    
+    Args:
+        data: 要写入的数据
+        file_path: 输出文件路径
+        pretty: 是否缩进2格输出，为False时输出紧凑格式
+        depth: 逐键写入的字典层数
+    """
+    with open(file_path, 'wb', buffering=65536) as f:
+        for chunk in _iter_json_chunks(data, 0, depth, pretty):
+            f.write(chunk)
+
+
+def _iter_json_chunks(data: Any, level: int, depth: int, pretty: bool):
+    """逐段生成JSON编码结果
+    
+    Args:
+        data: 要编码的数据
+        level: 当前嵌套层级
+        depth: 逐键编码的字典层数
+        pretty: 是否缩进2格输出
+        
+    Yields:
+        编码后的字节串片段
+    """
+    if level >= depth or type(data) is not dict or not data:
+        payload = _encode_json(data, pretty)
+        if pretty and level:
+            # 整体编码的值从第0层缩进开始，需要补齐当前层级的缩进
+            payload = payload.replace(b'\n', b'\n' + b'  ' * level)
+        yield payload
+        return
+    
+    if pretty:
+        inner_indent = b'\n' + b'  ' * (level + 1)
+        opening, separator, colon = b'{' + inner_indent, b',' + inner_indent, b': '
+        closing = b'\n' + b'  ' * level + b'}'
+    else:
+        opening, separator, colon, closing = b'{', b',', b':', b'}'
+    
+    yield opening
+    for index, (key, value) in enumerate(data.items()):
+        if index:
+            yield separator
+        # 非字符串键按json模块的规则转换，例如True转为"true"
+        if type(key) is not str:
+            key = json.dumps(key)
+        yield _encode_json(key, False)
+        yield colon
+        yield from _iter_json_chunks(value, level + 1, depth, pretty)
+    yield closing
+
+
+@functools.lru_cache(maxsize=None)
+def compile_regex(pattern: str, flags: int = 0) -> re.Pattern:
+    """编译正则表达式并在进程内缓存，相同模式只编译一次
+    
+    Args:
+        pattern: 正则表达式
+        flags: 正则标志
+        
+    Returns:
+        编译后的正则对象
+    """
+    return re.compile(pattern, flags)
+
+
+def popcount(value: int) -> int:
+    """统计非负整数二进制表示中1的个数"""
+    return bin(value).count('1')
+
+
+if hasattr(int, 'bit_count'):  # Python 3.10+
+    popcount = int.bit_count
+
+
+def build_membership_bitsets(item_sets: Dict[str, Any], shared_only: bool = False) -> Dict[str, int]:
+    """将多个集合编码为位图，便于用按位与和popcount快速求交集大小
+    
+    所有集合共用一个元素编号表，第i位为1表示集合包含编号为i的元素
+    
+    Args:
+        item_sets: 名称到元素集合的映射
+        shared_only: 只为出现在至少两个集合中的元素编号。只属于一个集合的元素
+            不会出现在任何交集里，跳过后位图更短，交集大小不变
+    
+    Returns:
+        名称到位图（Python整数）的映射
+    """
+    index = {}
+    bitsets = {}
+    
+    if shared_only:
+        element_counts = Counter()
+        for items in item_sets.values():
+            element_counts.update(items)
+        for item, count in element_counts.items():
+            if count > 1:
+                index[item] = len(index)
+    
+    for name, items in item_sets.items():
+        if shared_only:
+            positions = [index[item] for item in items if item in index]
+        else:
+            positions = [index.setdefault(item, len(index)) for item in items]
+        bits = bytearray(max(positions) // 8 + 1 if positions else 0)
+        for position in positions:
+            bits[position >> 3] |= 1 << (position & 7)
+        bitsets[name] = int.from_bytes(bits, 'little')
+    
+    return bitsets
+
+
 def format_bytes(bytes_value: int) -> str:
     """格式化字节数为可读格式
     
@@ -160,9 +413,7 @@ def extract_urls_from_text(text: str) -> List[str]:
     Returns:
         URL列表
     """
-    import re
-    
-    url_pattern = re.compile(
+    url_pattern = compile_regex(
         r'https?://(?:[-\w.])+(?:[:\d]+)?(?:/(?:[\w/_.])*(?:\?(?:[\w&=%.])*)?(?:#(?:[\w.])*)?)?',
         re.IGNORECASE
     )
@@ -171,6 +422,10 @@ def extract_urls_from_text(text: str) -> List[str]:
     return list(set(urls))  # 去重
 
 
+# 0x00-0x7F全部字节，供bytes.translate删除ASCII字节
+_ASCII_BYTES = bytes(range(128))
+
+
 def is_binary_file(file_path: str) -> bool:
     """判断文件是否为二进制文件
     
@@ -186,8 +441,8 @@ def is_binary_file(file_path: str) -> bool:
             if b'\x00' in chunk:
                 return True
             
-            # 检查非ASCII字符比例
-            non_ascii_count = sum(1 for byte in chunk if byte > 127)
+            # 检查非ASCII字符比例，删除ASCII字节后剩余的长度即非ASCII字节数
+            non_ascii_count = len(chunk.translate(None, _ASCII_BYTES))
             return non_ascii_count / len(chunk) > 0.3 if chunk else False
             
     except Exception:
@@ -203,10 +458,8 @@ def safe_filename(filename: str) -> str:
     Returns:
         安全的文件名
     """
-    import re
-    
     # 移除不安全字符
-    safe_name = re.sub(r'[<>:"/\\|?*]', '_', filename)
+    safe_name = compile_regex(r'[<>:"/\\|?*]').sub('_', filename)
     
     # 限制长度
     if len(safe_name) > 100:
@@ -5,10 +5,25 @@ IPA相似性分析 - 优化版本
 """
 
 import os
-import json
+import sys
 import sqlite3
+import functools
 from datetime import datetime
 from collections import defaultdict
+from itertools import takewhile
+from concurrent.futures import ProcessPoolExecutor
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from utils import build_membership_bitsets, dump_json_stream, load_json, parse_json, popcount
+
+# 参与相似度计算的字符串长度范围，过短的字符串没有区分度，过长的几乎不会在应用间重复
+MIN_SIMILARITY_STRING_LENGTH = 4
+MAX_SIMILARITY_STRING_LENGTH = 256
+
+# 分析文件达到该数量时才使用进程池并行加载，文件少时进程启动开销大于解析耗时
+PARALLEL_LOAD_MIN_FILES = 8
 
 class IPASimilarityAnalyzer:
     def __init__(self, db_path=None):
@@ -45,16 +60,22 @@ class IPASimilarityAnalyzer:
     
     def _update_word_library(self):
         """静默更新词库"""
-        for filename in os.listdir(self.analysis_dir):
-            if filename.endswith('_analysis.json') and filename != 'similarity_analysis.json':
-                filepath = os.path.join(self.analysis_dir, filename)
-                self._add_to_library_silent(filepath)
+        for entry in self._scan_analysis_files():
+            self._add_to_library_silent(entry.path)
+    
+    def _scan_analysis_files(self):
+        """列出分析目录中的应用分析文件"""
+        with os.scandir(self.analysis_dir) as entries:
+            return [
+                entry for entry in entries
+                if entry.name.endswith('_analysis.json') and entry.name != 'similarity_analysis.json'
+            ]
     
     def _add_to_library_silent(self, filepath):
         """静默添加文件到词库"""
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(filepath, 'rb') as f:
+                raw = f.read()
             
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
@@ -62,16 +83,17 @@ class IPASimilarityAnalyzer:
             # 创建表（如果不存在）
             self._create_tables(cursor)
             
-            # 检查是否已存在
+            # 检查是否已存在（先查库，已入库的文件无需解析JSON）
             import hashlib
-            with open(filepath, 'rb') as f:
-                file_hash = hashlib.md5(f.read()).hexdigest()
+            file_hash = hashlib.md5(raw).hexdigest()
             
             cursor.execute("SELECT id FROM apps WHERE file_hash = ?", (file_hash,))
             if cursor.fetchone():
                 conn.close()
                 return
             
+            data = parse_json(raw)
+            
             # 添加应用
             app_name = os.path.basename(filepath).replace('_analysis.json', '')
             app_info = data.get('app_info', {})
@@ -95,25 +117,25 @@ class IPASimilarityAnalyzer:
             if 'categories' in strings_data:
                 strings_data = strings_data['categories']
             
+            word_rows = []
             for category, strings_list in strings_data.items():
                 if isinstance(strings_list, list):
                     for item in strings_list:
                         content = item if isinstance(item, str) else item.get('content', '') if isinstance(item, dict) else ''
                         if content and len(content) >= 3 and not content.isdigit():
                             content_hash = hashlib.md5(content.encode('utf-8')).hexdigest()
-                            
-                            cursor.execute("""
-                                INSERT OR IGNORE INTO words (content, content_hash, category)
-                                VALUES (?, ?, ?)
-                            """, (content, content_hash, category))
-                            
-                            cursor.execute("SELECT id FROM words WHERE content_hash = ?", (content_hash,))
-                            word_id = cursor.fetchone()[0]
-                            
-                            cursor.execute("""
-                                INSERT OR IGNORE INTO word_app_relations (word_id, app_id)
-                                VALUES (?, ?)
-                            """, (word_id, app_id))
+                            word_rows.append((content, content_hash, category))
+            
+            # 批量写入词汇及应用关联
+            cursor.executemany("""
+                INSERT OR IGNORE INTO words (content, content_hash, category)
+                VALUES (?, ?, ?)
+            """, word_rows)
+            
+            cursor.executemany("""
+                INSERT OR IGNORE INTO word_app_relations (word_id, app_id)
+                SELECT id, ? FROM words WHERE content_hash = ?
+            """, ((app_id, content_hash) for _, content_hash, _ in word_rows))
             
             conn.commit()
             conn.close()
@@ -219,8 +241,7 @@ class IPASimilarityAnalyzer:
         """显示相似性结果"""
         similarity_file = os.path.join(self.analysis_dir, 'similarity_analysis.json')
         if os.path.exists(similarity_file):
-            with open(similarity_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = load_json(similarity_file)
             
             if 'pairwise_similarity' in data:
                 pairwise = data['pairwise_similarity']
@@ -236,66 +257,79 @@ class IPASimilarityAnalyzer:
     
     def _calculate_similarity(self):
         """计算相似性"""
-        # 加载分析文件
-        analyses = {}
-        for filename in os.listdir(self.analysis_dir):
-            if filename.endswith('_analysis.json') and filename != 'similarity_analysis.json':
-                filepath = os.path.join(self.analysis_dir, filename)
-                try:
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                    app_name = filename.replace('_analysis.json', '')
-                    analyses[app_name] = data
-                except Exception:
-                    continue
+        # 加载分析文件，加载后立即提取字符串集合和Bundle ID，完整的分析结果不再保留
+        entries = self._scan_analysis_files()
+        paths = [entry.path for entry in entries]
+        if len(paths) >= PARALLEL_LOAD_MIN_FILES:
+            # JSON解析受GIL限制，多个文件交给进程池并行解析
+            with ProcessPoolExecutor(max_workers=min(len(paths), os.cpu_count() or 1)) as executor:
+                loaded = list(executor.map(_load_app_features, paths))
+        else:
+            loaded = [_load_app_features(path) for path in paths]
+        
+        features = {}
+        for entry, app_features in zip(entries, loaded):
+            if app_features is not None:
+                features[entry.name.replace('_analysis.json', '')] = app_features
+        
+        # 字符串集合编码为位图，每对应用的交集大小由按位与后的置位数得出，只有共享字符串占用位
+        string_bits = build_membership_bitsets(
+            {app_name: f['strings'] for app_name, f in features.items()}, shared_only=True
+        )
+        
+        # 成对比较只用到字符串数量、位图和Bundle ID分段，预先取出避免在O(N²)循环中反复查字典
+        app_rows = [
+            (app_name, len(f['strings']), string_bits[app_name], f['bundle_parts'])
+            for app_name, f in features.items()
+        ]
         
         # 计算成对相似性
         pairwise_similarity = {}
-        app_names = list(analyses.keys())
+        pair_similarity = self._calculate_pairwise_similarity
         
-        for i, app1 in enumerate(app_names):
-            for j, app2 in enumerate(app_names[i+1:], i+1):
-                similarity = self._calculate_pairwise_similarity(
-                    analyses[app1], analyses[app2]
-                )
-                pairwise_similarity[f'{app1}_vs_{app2}'] = similarity
+        for i, row1 in enumerate(app_rows):
+            app1 = row1[0]
+            for row2 in app_rows[i + 1:]:
+                pairwise_similarity[f'{app1}_vs_{row2[0]}'] = pair_similarity(row1, row2)
         
         # 保存结果
         similarity_results = {
             'pairwise_similarity': pairwise_similarity,
             'analysis_timestamp': datetime.now().isoformat(),
-            'total_apps': len(analyses)
+            'total_apps': len(features)
         }
         
-        with open(os.path.join(self.analysis_dir, 'similarity_analysis.json'), 'w', encoding='utf-8') as f:
-            json.dump(similarity_results, f, ensure_ascii=False, indent=2)
+        # 成对结果逐个编码写入，编码缓冲不随应用对数量增长
+        dump_json_stream(similarity_results, os.path.join(self.analysis_dir, 'similarity_analysis.json'))
+    
+    @staticmethod
+    def _extract_features(app_data):
+        """提取计算相似性所需的应用特征"""
+        bundle_id = app_data.get('app_info', {}).get('bundle_id', '')
+        return {
+            'strings': IPASimilarityAnalyzer._extract_strings(app_data.get('strings', {})),
+            'bundle_parts': tuple(sys.intern(part) for part in bundle_id.split('.')) if bundle_id else None
+        }
     
-    def _calculate_pairwise_similarity(self, app1_data, app2_data):
-        """计算成对相似性"""
-        # 提取字符串
-        strings1 = self._extract_strings(app1_data.get('strings', {}))
-        strings2 = self._extract_strings(app2_data.get('strings', {}))
+    def _calculate_pairwise_similarity(self, row1, row2):
+        """计算成对相似性
+        
+        Args:
+            row1: 第一个应用的(名称, 字符串数量, 字符串位图, Bundle ID分段)
+            row2: 第二个应用的同结构元组
+        """
+        _, count1, bits1, parts1 = row1
+        _, count2, bits2, parts2 = row2
         
         # 字符串相似性
-        common_strings = strings1.intersection(strings2)
-        total_unique_strings = strings1.union(strings2)
-        string_similarity = len(common_strings) / len(total_unique_strings) if total_unique_strings else 0
+        # 并集大小由容斥原理得出，无需构建并集
+        common_count = popcount(bits1 & bits2)
+        union_count = count1 + count2 - common_count
+        string_similarity = common_count / union_count if union_count else 0
         
         # Bundle ID相似性
-        bundle1 = app1_data.get('app_info', {}).get('bundle_id', '')
-        bundle2 = app2_data.get('app_info', {}).get('bundle_id', '')
-        
-        if bundle1 and bundle2:
-            parts1 = bundle1.split('.')
-            parts2 = bundle2.split('.')
-            common_prefix_length = 0
-            for p1, p2 in zip(parts1, parts2):
-                if p1 == p2:
-                    common_prefix_length += 1
-                else:
-                    break
-            max_parts = max(len(parts1), len(parts2))
-            bundle_similarity = common_prefix_length / max_parts if max_parts > 0 else 0.0
+        if parts1 and parts2:
+            bundle_similarity = _bundle_similarity(parts1, parts2)
         else:
             bundle_similarity = 0.0
         
@@ -308,8 +342,9 @@ class IPASimilarityAnalyzer:
             'overall_similarity': round(overall_similarity * 100, 2)
         }
     
-    def _extract_strings(self, strings_data):
-        """提取字符串"""
+    @staticmethod
+    def _extract_strings(strings_data):
+        """提取长度在比较范围内的字符串，相同内容在多个应用间共享同一个字符串对象"""
         all_strings = set()
         
         # 处理不同的数据结构
@@ -320,9 +355,13 @@ class IPASimilarityAnalyzer:
             if isinstance(strings_list, list):
                 for item in strings_list:
                     if isinstance(item, dict) and 'content' in item:
-                        all_strings.add(item['content'])
+                        content = item['content']
                     elif isinstance(item, str):
-                        all_strings.add(item)
+                        content = item
+                    else:
+                        continue
+                    if MIN_SIMILARITY_STRING_LENGTH <= len(content) <= MAX_SIMILARITY_STRING_LENGTH:
+                        all_strings.add(sys.intern(content))
         
         return all_strings
     
@@ -372,6 +411,36 @@ class IPASimilarityAnalyzer:
         else:
             print("\n❌ 未找到重复词汇")
 
+@functools.lru_cache(maxsize=None)
+def _bundle_similarity(parts1, parts2):
+    """计算两个Bundle ID的公共前缀占比
+    
+    同一开发者的应用共享相同的前缀组合，按分段元组缓存结果
+    
+    Args:
+        parts1: 第一个Bundle ID按'.'拆分后的元组
+        parts2: 第二个Bundle ID按'.'拆分后的元组
+    
+    Returns:
+        公共前缀段数与较长Bundle ID段数之比
+    """
+    common_prefix_length = sum(1 for _ in takewhile(lambda pair: pair[0] == pair[1], zip(parts1, parts2)))
+    max_parts = max(len(parts1), len(parts2))
+    return common_prefix_length / max_parts if max_parts > 0 else 0.0
+
+
+def _load_app_features(file_path):
+    """加载分析文件并提取相似性特征，可在工作进程中调用
+    
+    Returns:
+        特征字典，加载失败时返回None
+    """
+    try:
+        return IPASimilarityAnalyzer._extract_features(load_json(file_path))
+    except Exception:
+        return None
+
+
 def main():
     """主函数"""
     analyzer = IPASimilarityAnalyzer()